@@ -5,18 +5,67 @@ This module serves as the main entry point for the application,
 supporting both GUI and CLI modes.
 """
 
+import os
 import sys
-from .cli import cli
-from .gui import run_gui
+from typing import List
+
+# Commands dispatched through argparse instead of click to keep startup cheap
+FAST_COMMANDS = ('process', 'batch')
+
+
+def _existing_path(value: str) -> str:
+    """Argparse type that requires the path to exist."""
+    import argparse
+
+    if not os.path.exists(value):
+        raise argparse.ArgumentTypeError(f"Path '{value}' does not exist.")
+    return value
+
+
+def run_fast_command(argv: List[str]) -> None:
+    """Run the process or batch command without loading click.
+    
+    Args:
+        argv: Command-line arguments, starting with the command name.
+    """
+    import argparse
+    from .commands import run_process, run_batch
+
+    parser = argparse.ArgumentParser(prog='photometa-restore')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    process_parser = subparsers.add_parser('process')
+    process_parser.add_argument('directory', type=_existing_path)
+    process_parser.add_argument('--edited-suffix', '-e')
+    process_parser.add_argument('--verbose', '-v', action='store_true')
+    
+    batch_parser = subparsers.add_parser('batch')
+    batch_parser.add_argument('directory', type=_existing_path)
+    batch_parser.add_argument('files', nargs='*')
+    batch_parser.add_argument('--edited-suffix', '-e')
+    batch_parser.add_argument('--verbose', '-v', action='store_true')
+    
+    args = parser.parse_args(argv)
+    if args.command == 'process':
+        run_process(args.directory, args.edited_suffix, verbose=args.verbose)
+    else:
+        run_batch(args.directory, args.files, args.edited_suffix, verbose=args.verbose)
+
 
 def main():
     """Run the application in either GUI or CLI mode."""
     if len(sys.argv) > 1:
         # If arguments are provided, run in CLI mode
-        cli()
+        args = sys.argv[1:]
+        if args[0] in FAST_COMMANDS and not {'-h', '--help'} & set(args):
+            run_fast_command(args)
+        else:
+            from .cli import cli
+            cli()
     else:
         # No arguments, run in GUI mode
+        from .gui import run_gui
         run_gui()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
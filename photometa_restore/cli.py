@@ -6,14 +6,13 @@ This module provides a command-line interface for PhotoMeta Restore.
 
 import os
 import sys
-import argparse
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional, List
 import click
-from tqdm import tqdm
 
 from .config import get_config
-from .processor import process_directory, MediaProcessor
-from .utils.benchmarking import PerformanceMonitor, create_test_dataset
+from .commands import get_processor, run_process, run_batch
+from .utils.json_utils import load_json_file
 
 
 def cli_progress_callback(progress: float, success_count: int, error_count: int) -> None:
@@ -29,11 +28,26 @@ def cli_progress_callback(progress: float, success_count: int, error_count: int)
     sys.stdout.flush()
 
 
-def show_progress(progress: float, success: int, total: int):
-    """Show progress bar for batch processing."""
-    with tqdm(total=total) as pbar:
-        pbar.update(int(progress * total))
-        pbar.set_description(f"Processed: {success}/{total}")
+# Number of completed files between progress bar updates
+PROGRESS_BATCH_SIZE = 64
+
+
+def batched_progress(pbar, total: int) -> Callable[[float], None]:
+    """Create a progress callback that advances a tqdm bar in batches.
+    
+    Args:
+        pbar: Progress bar to update.
+        total: Number of files the bar represents.
+        
+    Returns:
+        Callback taking the completed fraction (0-1).
+    """
+    def update(progress: float) -> None:
+        done = int(progress * total)
+        if done - pbar.n >= PROGRESS_BATCH_SIZE or done >= total:
+            pbar.update(done - pbar.n)
+    
+    return update
 
 
 @click.group()
@@ -45,53 +59,49 @@ def cli():
 @cli.command()
 @click.argument('directory', type=click.Path(exists=True))
 @click.option('--edited-suffix', '-e', help='Suffix for edited files')
-def process(directory: str, edited_suffix: str):
+@click.option('--verbose', '-v', is_flag=True, help='Show a message for every processed file')
+def process(directory: str, edited_suffix: str, verbose: bool):
     """Process a directory to restore metadata."""
-    success, errors = process_directory(
-        directory,
-        edited_suffix=edited_suffix,
-        progress_callback=show_progress
-    )
-    click.echo(f"Processing complete. Success: {success}, Errors: {errors}")
+    run_process(directory, edited_suffix, echo=click.echo, verbose=verbose)
 
 
 @cli.command()
 @click.argument('directory', type=click.Path(exists=True))
-@click.argument('files', nargs=-1, type=click.Path(exists=True))
+@click.argument('files', nargs=-1, type=click.Path())
 @click.option('--edited-suffix', '-e', help='Suffix for edited files')
-def batch(directory: str, files: List[str], edited_suffix: str):
+@click.option('--verbose', '-v', is_flag=True, help='Show a message for every processed file')
+def batch(directory: str, files: List[str], edited_suffix: str, verbose: bool):
     """Process a batch of files with automatic backup."""
-    processor = MediaProcessor(directory, edited_suffix)
-    results = processor.process_batch(list(files), progress_callback=lambda p: show_progress(p, 0, len(files)))
-    
-    click.echo("\nBatch processing complete:")
-    click.echo(f"Successful: {len(results['successful'])}")
-    click.echo(f"Failed: {len(results['failed'])}")
-    click.echo(f"Backups created: {len(results['backups'])}")
-    
-    if results['failed']:
-        click.echo("\nFailed files:")
-        for failure in results['failed']:
-            if isinstance(failure, tuple):
-                click.echo(f"  {failure[0]}: {failure[1]}")
-            else:
-                click.echo(f"  {failure}")
+    run_batch(directory, files, edited_suffix, echo=click.echo, verbose=verbose)
 
 
 @cli.command()
 @click.argument('directory', type=click.Path(exists=True))
 @click.argument('template_name', type=str)
-@click.argument('files', nargs=-1, type=click.Path(exists=True))
-def apply_template(directory: str, template_name: str, files: List[str]):
+@click.argument('files', nargs=-1, type=click.Path())
+@click.option('--replace-exif', is_flag=True, help='Replace the existing EXIF data instead of updating it')
+def apply_template(directory: str, template_name: str, files: List[str], replace_exif: bool):
     """Apply a metadata template to files."""
-    processor = MediaProcessor(directory)
+    from tqdm import tqdm
+
+    processor = get_processor(directory)
     success = 0
     
     with tqdm(total=len(files)) as pbar:
-        for file in files:
-            if processor.apply_template(file, template_name):
-                success += 1
-            pbar.update(1)
+        with ThreadPoolExecutor(max_workers=get_config().MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(processor.apply_template, file, template_name, not replace_exif)
+                for file in files
+            ]
+            pending = 0
+            for future in as_completed(futures):
+                if future.result():
+                    success += 1
+                pending += 1
+                if pending >= PROGRESS_BATCH_SIZE:
+                    pbar.update(pending)
+                    pending = 0
+            pbar.update(pending)
     
     click.echo(f"\nTemplate application complete. Success: {success}, Failed: {len(files) - success}")
 
@@ -99,15 +109,16 @@ def apply_template(directory: str, template_name: str, files: List[str]):
 @cli.command()
 @click.argument('directory', type=click.Path(exists=True))
 @click.argument('template_name', type=str)
-@click.argument('metadata_file', type=click.Path(exists=True))
+@click.argument('metadata_file', type=click.Path())
 def save_template(directory: str, template_name: str, metadata_file: str):
     """Save a metadata file as a template."""
-    processor = MediaProcessor(directory)
+    processor = get_processor(directory)
     try:
-        with open(metadata_file, 'r') as f:
-            metadata = f.read()
+        metadata = load_json_file(metadata_file)
         processor.template_handler.save_template(template_name, metadata)
         click.echo(f"Template '{template_name}' saved successfully.")
+    except FileNotFoundError:
+        raise click.BadParameter(f"File '{metadata_file}' does not exist.", param_hint="'METADATA_FILE'")
     except Exception as e:
         click.echo(f"Error saving template: {str(e)}", err=True)
 
@@ -116,7 +127,7 @@ def save_template(directory: str, template_name: str, metadata_file: str):
 @click.argument('directory', type=click.Path(exists=True))
 def list_templates(directory: str):
     """List available metadata templates."""
-    processor = MediaProcessor(directory)
+    processor = get_processor(directory)
     templates = processor.template_handler.list_templates()
     
     if templates:
@@ -132,7 +143,7 @@ def list_templates(directory: str):
 @click.argument('file', type=click.Path(exists=True))
 def backup(directory: str, file: str):
     """Create a backup of file metadata."""
-    processor = MediaProcessor(directory)
+    processor = get_processor(directory)
     backup_path = processor.backup_metadata(file)
     
     if backup_path:
@@ -146,7 +157,7 @@ def backup(directory: str, file: str):
 @click.argument('backup_file', type=click.Path(exists=True))
 def restore(directory: str, backup_file: str):
     """Restore metadata from a backup file."""
-    processor = MediaProcessor(directory)
+    processor = get_processor(directory)
     if processor.restore_from_backup(backup_file):
         click.echo("Metadata restored successfully.")
     else:
@@ -166,6 +177,8 @@ def benchmark():
 @click.option('--with-metadata/--no-metadata', default=True, help='Create metadata files')
 def create_dataset(directory: str, num_files: int, file_size: int, with_metadata: bool):
     """Create a test dataset for benchmarking."""
+    from .utils.benchmarking import create_test_dataset
+
     test_dir = create_test_dataset(directory, num_files, file_size, with_metadata)
     click.echo(f"Created test dataset at: {test_dir}")
     click.echo(f"Number of files: {num_files}")
@@ -179,6 +192,9 @@ def create_dataset(directory: str, num_files: int, file_size: int, with_metadata
 @click.option('--iterations', '-i', type=int, default=1, help='Number of test iterations')
 def run(directory: str, operation: str, iterations: int):
     """Run performance benchmarks."""
+    from tqdm import tqdm
+    from .utils.benchmarking import PerformanceMonitor
+
     monitor = PerformanceMonitor()
     
     for i in range(iterations):
@@ -187,32 +203,35 @@ def run(directory: str, operation: str, iterations: int):
         # Start monitoring
         monitor.start_operation()
         
-        # Get list of files
-        json_files = [f for f in os.listdir(directory) if f.endswith('.json')]
-        total_files = len(json_files)
+        # Get list of files (DirEntry objects carry file type info, avoiding extra stats)
+        json_entries = [
+            entry for entry in os.scandir(directory)
+            if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)
+        ]
+        total_files = len(json_entries)
         
         if total_files == 0:
             click.echo("No JSON files found in directory.")
             return
         
-        processor = MediaProcessor(directory)
+        processor = get_processor(directory)
         success_count = 0
         
         with tqdm(total=total_files) as pbar:
             if operation == 'batch':
                 # Batch processing
                 results = processor.process_batch(
-                    [os.path.join(directory, f) for f in json_files],
-                    progress_callback=lambda p: pbar.update(1)
+                    [entry.path for entry in json_entries],
+                    progress_callback=batched_progress(pbar, total_files)
                 )
                 success_count = len(results['successful'])
             
             elif operation == 'single':
-                # Single file processing
-                for json_file in json_files:
-                    if processor.process_json_file(os.path.join(directory, json_file)):
-                        success_count += 1
-                    pbar.update(1)
+                # Single file processing (no backups), driven as one call
+                success_count = processor.process_files(
+                    [entry.path for entry in json_entries],
+                    progress_callback=batched_progress(pbar, total_files)
+                )
             
             elif operation == 'template':
                 # Template processing
@@ -230,10 +249,15 @@ def run(directory: str, operation: str, iterations: int):
                     }
                 })
                 
-                for json_file in json_files:
-                    if processor.apply_template(os.path.join(directory, json_file), template_name):
+                pending = 0
+                for entry in json_entries:
+                    if processor.apply_template(entry.path, template_name):
                         success_count += 1
-                    pbar.update(1)
+                    pending += 1
+                    if pending >= PROGRESS_BATCH_SIZE:
+                        pbar.update(pending)
+                        pending = 0
+                pbar.update(pending)
         
         # Record metrics
         monitor.end_operation(total_files, success_count, f"{operation}_process")
@@ -246,6 +270,8 @@ def run(directory: str, operation: str, iterations: int):
 @click.option('--operation', '-o', type=str, help='Filter by operation type')
 def report(operation: Optional[str]):
     """Display benchmark reports."""
+    from .utils.benchmarking import PerformanceMonitor
+
     monitor = PerformanceMonitor()
     click.echo(monitor.generate_report(operation))
 
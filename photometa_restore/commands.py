@@ -0,0 +1,109 @@
+"""
+Command implementations for PhotoMeta Restore.
+
+This module contains the bodies of the processing commands. It does not
+depend on click, so the commands can be dispatched either through the click
+CLI or through the lightweight argparse path in __main__.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Iterator, Optional, Sequence
+
+from .processor import process_directory, MediaProcessor
+from .utils.logging_utils import setup_console_logging
+
+
+@lru_cache(maxsize=8)
+def get_processor(directory: str, edited_suffix: Optional[str] = None) -> MediaProcessor:
+    """Get a MediaProcessor for a directory, reusing one created earlier in this session.
+    
+    Args:
+        directory: Directory to process.
+        edited_suffix: Suffix for edited files.
+        
+    Returns:
+        MediaProcessor instance for the directory.
+    """
+    return MediaProcessor(directory, edited_suffix)
+
+
+@contextmanager
+def progress_bar(total: int) -> Iterator[Callable[..., None]]:
+    """Show a single progress bar for the duration of an operation.
+    
+    Args:
+        total: Number of units the bar represents.
+        
+    Yields:
+        Callback taking the completed fraction (0-1) and optional success/error counts.
+    """
+    from tqdm import tqdm
+
+    with tqdm(total=total) as pbar:
+        def update(progress: float, success: Optional[int] = None, errors: Optional[int] = None) -> None:
+            pbar.update(int(progress * total) - pbar.n)
+            if success is not None:
+                pbar.set_description(f"Success: {success}, Errors: {errors or 0}")
+        
+        yield update
+
+
+def run_process(
+    directory: str,
+    edited_suffix: Optional[str],
+    echo: Callable[[str], None] = print,
+    verbose: bool = False
+) -> None:
+    """Process a directory to restore metadata.
+    
+    Args:
+        directory: Directory to process.
+        edited_suffix: Suffix for edited files.
+        echo: Function used to print output.
+        verbose: Show a message for every processed file.
+    """
+    setup_console_logging(verbose)
+    with progress_bar(100) as update:
+        success, errors = process_directory(
+            directory,
+            edited_suffix=edited_suffix,
+            progress_callback=lambda progress, s, e: update(progress / 100, s, e)
+        )
+        update(1.0, success, errors)
+    echo(f"Processing complete. Success: {success}, Errors: {errors}")
+
+
+def run_batch(
+    directory: str,
+    files: Sequence[str],
+    edited_suffix: Optional[str],
+    echo: Callable[[str], None] = print,
+    verbose: bool = False
+) -> None:
+    """Process a batch of files with automatic backup.
+    
+    Args:
+        directory: Base directory of the files.
+        files: Files to process.
+        edited_suffix: Suffix for edited files.
+        echo: Function used to print output.
+        verbose: Show a message for every processed file.
+    """
+    setup_console_logging(verbose)
+    processor = get_processor(directory, edited_suffix)
+    with progress_bar(len(files)) as update:
+        results = processor.process_batch(files, progress_callback=update)
+    
+    echo("\nBatch processing complete:")
+    echo(f"Successful: {len(results['successful'])}")
+    echo(f"Failed: {len(results['failed'])}")
+    echo(f"Backups created: {len(results['backups'])}")
+    
+    if results['failed']:
+        echo("\nFailed files:")
+        for failure in results['failed']:
+            if isinstance(failure, tuple):
+                echo(f"  {failure[0]}: {failure[1]}")
+            else:
+                echo(f"  {failure}")
@@ -5,16 +5,20 @@ This module contains default values and settings that can be customized by the u
 """
 
 import os
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field, fields, replace
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Mapping, Optional
 
 # Version information
 __version__ = '1.0.0'
 
 
-@dataclass
+@dataclass(frozen=True)
 class Config:
-    """Main configuration class for PhotoMeta Restore."""
+    """Main configuration class for PhotoMeta Restore.
+    
+    Instances are immutable; use update_config to change the global configuration.
+    """
     
     # Version information
     __version__: str = __version__
@@ -23,9 +27,11 @@ class Config:
     DEFAULT_EDITED_SUFFIX: str = "edited"
     
     # Supported file formats for EXIF manipulation
-    EXIF_SUPPORTED_FORMATS: List[str] = field(
-        default_factory=lambda: ["tif", "tiff", "jpeg", "jpg"]
-    )
+    # (casefolded extensions, without the leading dot)
+    EXIF_SUPPORTED_FORMATS: FrozenSet[str] = frozenset({"tif", "tiff", "jpeg", "jpg"})
+    
+    # Maximum number of worker threads for parallel file operations
+    MAX_WORKERS: int = min(32, (os.cpu_count() or 1) * 4)
     
     # Directory names
     MATCHED_MEDIA_DIR: str = "MatchedMedia"
@@ -37,22 +43,22 @@ class Config:
     MISSING_FILES_LOG_PATTERN: str = "missing_files_{timestamp}.log"
     
     # Error messages
-    ERROR_MESSAGES: Dict[str, str] = field(
-        default_factory=lambda: {
+    ERROR_MESSAGES: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({
             "invalid_directory": "Please select a valid directory",
             "file_not_found": "File not found: {filepath}",
             "processing_error": "Error processing file: {error}",
             "metadata_error": "Error setting metadata: {error}",
             "moving_error": "Error moving file: {error}",
-        }
+        })
     )
     
     # Success message templates
     SUCCESS_MESSAGE: str = "Matching process finished with {success_count} {success_word} and {error_count} {error_word}."
     
     # UI color themes - using modern, professional colors
-    UI_COLORS: Dict[str, str] = field(
-        default_factory=lambda: {
+    UI_COLORS: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({
             "primary_color": "#2C5282",  # Deep blue
             "secondary_color": "#4A5568", # Dark slate gray
             "accent_color": "#3182CE",    # Bright blue
@@ -60,8 +66,25 @@ class Config:
             "success_color": "#38A169",   # Green
             "error_color": "#E53E3E",     # Red
             "processing_color": "#3182CE" # Blue
-        }
+        })
     )
+    
+    def format_success_message(self, success_count: int, error_count: int) -> str:
+        """Build the end-of-run summary message.
+        
+        Args:
+            success_count: Number of successfully processed files.
+            error_count: Number of files with errors.
+            
+        Returns:
+            SUCCESS_MESSAGE filled in with the counts and matching plural forms.
+        """
+        return self.SUCCESS_MESSAGE.format(
+            success_count=success_count,
+            success_word="success" if success_count == 1 else "successes",
+            error_count=error_count,
+            error_word="error" if error_count == 1 else "errors"
+        )
 
 
 # Create a global config instance
@@ -77,12 +100,20 @@ def get_config() -> Config:
     return config
 
 
-def update_config(updates: Dict[str, Any]) -> None:
+def update_config(updates: Dict[str, Any]) -> Config:
     """Update configuration values.
     
+    The global configuration is replaced with a copy containing the updates;
+    unknown keys are ignored.
+    
     Args:
         updates: Dictionary of configuration values to update.
+        
+    Returns:
+        Config: The new global configuration object.
     """
-    for key, value in updates.items():
-        if hasattr(config, key):
-            setattr(config, key, value) 
\ No newline at end of file
+    global config
+    
+    field_names = {f.name for f in fields(Config)}
+    config = replace(config, **{key: value for key, value in updates.items() if key in field_names})
+    return config 
\ No newline at end of file
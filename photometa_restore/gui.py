@@ -6,12 +6,23 @@ This module provides a graphical user interface for the PhotoMeta Restore applic
 
 import os
 import sys
+import queue
+import threading
 import PySimpleGUI as sg
-from typing import Optional
+from typing import Optional, Tuple
 
 from .config import get_config
 from .processor import process_directory
-from .resources.icon import get_icon_path
+from .resources.icon import get_icon_path, get_taskbar_icon_path
+
+# Event posted by the worker thread when processing finishes
+PROCESS_DONE_EVENT = '-PROCESS_DONE-'
+
+# Interval in milliseconds at which progress is drained while processing
+PROGRESS_POLL_MS = 50
+
+# Maximum number of pending progress updates from the worker thread
+PROGRESS_QUEUE_SIZE = 256
 
 
 def create_window() -> sg.Window:
@@ -91,7 +102,9 @@ def create_window() -> sg.Window:
         font=main_font,
         resizable=False,
         margins=(25, 25),
-        icon=icon_path
+        icon=icon_path,
+        # Closing is handled by the event loop, so it can be refused while processing
+        enable_close_attempted_event=True
     )
 
 
@@ -109,6 +122,37 @@ def update_progress(window: sg.Window, progress: float, success_count: int, erro
     window.refresh()
 
 
+def process_in_background(
+    window: sg.Window,
+    progress_queue: "queue.Queue[Tuple[float, int, int]]",
+    folder_path: str,
+    edited_suffix: str
+) -> None:
+    """Process a directory on a worker thread.
+    
+    Progress updates are pushed to progress_queue; when processing finishes the
+    (success_count, error_count) result is posted to the window as PROCESS_DONE_EVENT.
+    
+    Args:
+        window: PySimpleGUI window object.
+        progress_queue: Bounded queue receiving (progress, success_count, error_count).
+        folder_path: Directory to process.
+        edited_suffix: Suffix used for edited photos.
+    """
+    def report(progress: float, success_count: int, error_count: int) -> None:
+        try:
+            progress_queue.put_nowait((progress, success_count, error_count))
+        except queue.Full:
+            # Only the latest update is displayed, so dropping one is harmless
+            pass
+    
+    try:
+        result = process_directory(folder_path, edited_suffix, report)
+    except Exception as e:
+        result = e
+    window.write_event_value(PROCESS_DONE_EVENT, result)
+
+
 def show_help_popup() -> None:
     """Show help information in a popup."""
     config = get_config()
@@ -143,15 +187,13 @@ def run_gui() -> None:
     window = create_window()
     
     # Set window icon explicitly after creation
-    if icon_path := get_icon_path():
+    if icon_path := get_taskbar_icon_path():
         try:
-            # On Windows, set the taskbar icon
+            # On Windows, set the taskbar icon (shipped pre-rendered at 32x32)
             if hasattr(window, 'TKroot'):
-                from PIL import Image, ImageTk
+                import tkinter as tk
                 
-                img = Image.open(icon_path)
-                img = img.resize((32, 32), Image.LANCZOS)  # Resize to standard size
-                photo = ImageTk.PhotoImage(img)
+                photo = tk.PhotoImage(file=icon_path)
                 window.TKroot.iconphoto(True, photo)
         except Exception as e:
             print(f"Failed to set taskbar icon: {e}")
@@ -161,13 +203,42 @@ def run_gui() -> None:
     error_color = "#E53E3E"    # Red
     processing_color = "#3182CE"  # Blue
     
+    progress_queue: "queue.Queue[Tuple[float, int, int]]" = queue.Queue(maxsize=PROGRESS_QUEUE_SIZE)
+    processing = False
+    worker: Optional[threading.Thread] = None
+    
     while True:
-        event, values = window.read()
+        # Poll while processing so progress can be drained; otherwise block for events
+        event, values = window.read(timeout=PROGRESS_POLL_MS if processing else None)
         
-        if event == sg.WIN_CLOSED or event == 'Exit':
+        # Show only the most recent progress update
+        latest = None
+        while True:
+            try:
+                latest = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            update_progress(window, *latest)
+        
+        if event in (sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Exit'):
+            if processing:
+                # Stopping the worker mid-run could leave a half-written image and
+                # skip the JSON deletions and log flush at the end of the run
+                sg.popup_ok(
+                    "Processing is still running. Please wait for it to finish before closing.",
+                    font=('Segoe UI', 10),
+                    title="Processing",
+                    button_color=("#FFFFFF", processing_color),
+                    icon=get_icon_path()
+                )
+                continue
+            break
+        
+        if event == sg.WIN_CLOSED:
             break
             
-        elif event == 'Match':
+        elif event == 'Match' and not processing:
             folder_path = values['-FOLDER_PATH-']
             edited_suffix = values['-INPUT_TEXT-']
             
@@ -185,28 +256,37 @@ def run_gui() -> None:
             window['-PROGRESS_BAR-'].update(0, visible=True)
             window['-PROGRESS_LABEL-'].update("0% - Starting process...", text_color=processing_color, visible=True)
             
-            # Process the directory
-            success_count, error_count = process_directory(
-                folder_path, 
-                edited_suffix,
-                lambda progress, success, error: update_progress(window, progress, success, error)
+            # Process the directory on a worker thread
+            processing = True
+            window['Match'].update(disabled=True)
+            worker = threading.Thread(
+                target=process_in_background,
+                args=(window, progress_queue, folder_path, edited_suffix)
             )
+            worker.start()
+        
+        elif event == PROCESS_DONE_EVENT:
+            processing = False
+            window['Match'].update(disabled=False)
             
-            # Update final status
-            success_word = "success" if success_count == 1 else "successes"
-            error_word = "error" if error_count == 1 else "errors"
+            result = values[PROCESS_DONE_EVENT]
+            if isinstance(result, Exception):
+                window['-PROGRESS_LABEL-'].update(
+                    f"Error during processing: {result}",
+                    visible=True,
+                    text_color=error_color
+                )
+                continue
             
+            success_count, error_count = result
+            
+            # Update final status
             window['-PROGRESS_BAR-'].update(100, visible=True)
             
             # Set status color based on results
             status_color = success_color if success_count > 0 and error_count == 0 else error_color
             
-            status_message = config.SUCCESS_MESSAGE.format(
-                success_count=success_count,
-                success_word=success_word,
-                error_count=error_count,
-                error_word=error_word
-            )
+            status_message = config.format_success_message(success_count, error_count)
             
             if error_count > 0:
                 status_message += "\nCheck logs folder for details."
@@ -220,6 +300,9 @@ def run_gui() -> None:
         elif event == 'Help':
             show_help_popup()
     
+    # Let a running worker finish its files before the window goes away
+    if worker is not None:
+        worker.join()
     window.close()
     
 
@@ -6,14 +6,21 @@ to media files and applying metadata.
 """
 
 import os
-import json
+import re
 import logging
-from typing import Dict, List, Tuple, Optional, Any, Callable
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Optional, Any, Callable, Union
 from pathlib import Path
 
 from .config import get_config
-from .utils.logging_utils import setup_logging
+from .utils.logging_utils import flush_loggers, setup_logging
+from .utils.json_utils import load_json_file
 from .utils.file_operations import (
+    DirectoryIndex,
+    normalize_file_name,
     create_required_folders,
     safe_move_file,
     fix_title,
@@ -26,7 +33,38 @@ from .utils.metadata import (
     extract_metadata_from_json
 )
 from .utils.metadata_enhanced import MetadataBackup, MetadataTemplate, BatchProcessor
-from .utils.validation import validate_metadata_file, FileValidator, ValidationResult
+from .utils.validation import FileValidator, MetadataValidator, ValidationResult, MAX_METADATA_BYTES
+
+
+# Console diagnostics; the per-session error and missing-file logs are set up by setup_logging
+logger = logging.getLogger(__name__)
+
+# Approximate number of progress reports process_all makes over a run
+PROGRESS_REPORTS = 200
+
+# Number of queued JSON deletions after which they are carried out mid-run, so an
+# interrupted run leaves at most this many processed JSON files behind
+PENDING_UNLINK_LIMIT = 256
+
+# Length to which Google Takeout truncates long media file names (without extension)
+TRUNCATED_NAME_LENGTH = 47
+
+# Minimum number of matched files for which process_all uses a thread pool
+PARALLEL_THRESHOLD = 16
+
+# Candidate names for one stem of a title: (group_key, original_name, ((replacement, own_json), ...))
+StemCandidates = Tuple[str, str, Tuple[Tuple[str, Optional[str]], ...]]
+
+
+@dataclass
+class MediaMatch:
+    """A JSON file matched to the media file it describes."""
+    
+    json_path: str
+    media_path: str
+    media_title: str
+    dest_path: str
+    metadata: Dict[str, Any]
 
 
 class MediaProcessor:
@@ -43,14 +81,46 @@ class MediaProcessor:
         self.base_path = Path(base_path).resolve()
         self.edited_suffix = edited_suffix or self.config.DEFAULT_EDITED_SUFFIX
         
+        # Extensions whose EXIF data can be written (frozenset copy, so lookups stay
+        # constant-time even if the configuration holds another collection type)
+        self._exif_formats = frozenset(self.config.EXIF_SUPPORTED_FORMATS)
+        
+        # Text appended to the stem of edited files, built once per run (e.g. "-edited")
+        self._edited_tail = f"-{self.edited_suffix}"
+        
+        # Matches the edited and "(n)" endings stripped from stems to get group keys
+        self._variant_endings = re.compile(
+            r'(?:\(\d+\)|' + re.escape(normalize_file_name(self._edited_tail)) + r')+$'
+        )
+        
         # Setup output directories
         self.matched_media_dir, self.edited_raw_dir = create_required_folders(str(self.base_path))
         
+        # Directory prefixes (with trailing separator) used to build paths by concatenation
+        self._base_prefix = os.path.join(str(self.base_path), "")
+        self._matched_media_prefix = os.path.join(self.matched_media_dir, "")
+        self._edited_raw_prefix = os.path.join(self.edited_raw_dir, "")
+        
         # Setup logging
         self.error_logger, self.missing_logger = setup_logging(str(self.base_path))
         
+        # File checks are stateless, so one validator serves the whole run
+        self._file_validator = FileValidator(str(self.base_path))
+        
+        # Directories searched for media, in order of preference
+        self._search_paths = (str(self.base_path), self.matched_media_dir, self.edited_raw_dir)
+        
+        # Cached directory listings, keyed by directory path (see _listing)
+        self._dir_index: Dict[str, DirectoryIndex] = {}
+        
+        # Guards the counters and cached listings while matches are applied in parallel
+        self._lock = threading.RLock()
+        
+        # JSON files of processed media, deleted together by _unlink_pending
+        self._pending_unlinks: List[str] = []
+        
         # Track processed files
-        self.media_moved: List[str] = []
+        self.media_moved: Set[str] = set()
         self.success_counter = 0
         self.error_counter = 0
         
@@ -59,6 +129,96 @@ class MediaProcessor:
         self.template_handler = MetadataTemplate()
         self.batch_processor = BatchProcessor(self)
     
+    def _name_group(self, name: str) -> str:
+        """Get the group key of a normalized file name.
+        
+        The key is the name's stem without any trailing edited suffix or "(n)"
+        counters, so every candidate name search_media_file builds for a title
+        shares the key of the title's stem (or of its 47-character truncation).
+        
+        Args:
+            name: File name normalized with normalize_file_name.
+            
+        Returns:
+            Group key.
+        """
+        stem, dot, _ = name.rpartition('.')
+        if not dot:
+            stem = name
+        return self._variant_endings.sub('', stem)
+    
+    def _listing(self, directory: str) -> DirectoryIndex:
+        """Get the cached listing of a directory, scanning it on first use.
+        
+        Args:
+            directory: Directory to list.
+            
+        Returns:
+            DirectoryIndex of the directory.
+        """
+        listing = self._dir_index.get(directory)
+        if listing is None:
+            listing = DirectoryIndex(directory, self._name_group)
+            self._dir_index[directory] = listing
+        return listing
+    
+    def _record_added(self, path: str) -> None:
+        """Record a file created at path in the cached directory listings."""
+        directory, name = os.path.split(path)
+        self._listing(directory).add(name)
+    
+    def _record_removed(self, path: str) -> None:
+        """Record a file removed from path in the cached directory listings."""
+        directory, name = os.path.split(path)
+        self._listing(directory).discard(name)
+    
+    def _move_file(self, source_path: str, dest_path: str) -> bool:
+        """Move a file with safe_move_file and keep the cached listings in sync.
+        
+        Args:
+            source_path: Path to the source file.
+            dest_path: Path to the destination file.
+            
+        Returns:
+            bool: True if move was successful, False otherwise.
+        """
+        if not safe_move_file(source_path, dest_path):
+            return False
+        self._record_removed(source_path)
+        self._record_added(dest_path)
+        return True
+    
+    def _title_candidates(self, title: str, name: str, dot_ext: str) -> Tuple[StemCandidates, ...]:
+        """Build the candidate media names for a title, in match order.
+        
+        Stems are tried in order: the full name, then the truncation Google
+        applies to long names. For each stem the result holds the group key
+        shared by all of its candidate names, the original name and the
+        versions that replace it: the edited version, then the "(1)" version
+        unless its own "(1).json" exists (only checked for the full title).
+        
+        Args:
+            title: Fixed title from JSON.
+            name: Title without extension.
+            dot_ext: Extension of the title including the dot, or "".
+            
+        Returns:
+            One StemCandidates tuple per stem.
+        """
+        stems = (name, name[:TRUNCATED_NAME_LENGTH]) if len(name) > TRUNCATED_NAME_LENGTH else (name,)
+        return tuple(
+            (
+                # Key the full candidate name, as DirectoryIndex does for real files
+                self._name_group(normalize_file_name(stem + dot_ext)),
+                title if stem is name else stem + dot_ext,
+                (
+                    (stem + self._edited_tail + dot_ext, None),
+                    (stem + "(1)" + dot_ext, f"{title}(1).json" if stem is name else None),
+                ),
+            )
+            for stem in stems
+        )
+    
     def search_media_file(self, title: str) -> Optional[str]:
         """Search for media file matching the given title.
         
@@ -68,268 +228,366 @@ class MediaProcessor:
         Returns:
             Found media filename or None if not found.
         """
+        found = self._find_media_file(title)
+        return found[1] if found else None
+    
+    def _find_media_file(self, title: str) -> Optional[Tuple[str, str]]:
+        """Search for media file matching the given title.
+        
+        Args:
+            title: Original title from JSON.
+            
+        Returns:
+            Tuple of (directory, filename) of the found media file, or None if not found.
+        """
         title = fix_title(title)
         
         try:
-            # Split filename and extension
-            if '.' in title:
-                name, ext = title.rsplit('.', 1)
-            else:
-                # Handle files without extension
+            # Split filename and extension (files without one keep the whole title as name)
+            name, dot, ext = title.rpartition('.')
+            if not dot:
                 name = title
-                ext = ""
             
-            # Define search paths
-            search_paths = [
-                self.base_path,
-                Path(self.matched_media_dir),
-                Path(self.edited_raw_dir)
-            ]
+            base_path = self._search_paths[0]
+            dot_ext = f".{ext}" if ext else ""
             
-            # Check for edited version with suffix
-            if ext:
-                edited_name = f"{name}-{self.edited_suffix}.{ext}"
-            else:
-                edited_name = f"{name}-{self.edited_suffix}"
+            # Fast path for the common case: the original is in the base directory
+            # with no edited or "(1)" version next to it, so nothing else can match first
+            base_listing = self._listing(base_path)
+            if (title in base_listing
+                    and name + self._edited_tail + dot_ext not in base_listing
+                    and name + "(1)" + dot_ext not in base_listing):
+                return base_path, title
+            
+            candidates = self._title_candidates(title, name, dot_ext)
+            
+            # Name-conflict variants, computed at most once per stem (see check_if_same_name)
+            conflict_names: Dict[str, str] = {}
             
             # Search in all paths
-            for search_path in search_paths:
-                # Check for edited version
-                edited_path = search_path / edited_name
-                if edited_path.exists():
-                    # If found in base path, move original to edited_raw if it exists
-                    if search_path == self.base_path:
-                        orig_path = self.base_path / title
-                        if orig_path.exists():
-                            safe_move_file(str(orig_path), str(Path(self.edited_raw_dir) / title))
-                    return edited_name
+            for search_path in self._search_paths:
+                listing = self._listing(search_path)
                 
-                # Check for version with (1) suffix
-                if ext:
-                    alt_name = f"{name}(1).{ext}"
-                else:
-                    alt_name = f"{name}(1)"
-                
-                alt_path = search_path / alt_name
-                if alt_path.exists() and not (search_path / f"{title}(1).json").exists():
-                    # If found in base path, move original to edited_raw if it exists
-                    if search_path == self.base_path:
-                        orig_path = self.base_path / title
-                        if orig_path.exists():
-                            safe_move_file(str(orig_path), str(Path(self.edited_raw_dir) / title))
-                    return alt_name
-                
-                # Check for original version
-                orig_path = search_path / title
-                if orig_path.exists():
-                    return title
-                
-                # Check for possible name conflicts
-                alt_name = check_if_same_name(title, title, self.media_moved, 1)
-                alt_path = search_path / alt_name
-                if alt_path.exists():
-                    return alt_name
-                
-                # Try with truncated title (Google sometimes limits to 47 chars)
-                if len(name) > 47:
-                    short_name = name[:47]
-                    
-                    if ext:
-                        short_title = f"{short_name}.{ext}"
-                        short_edited_name = f"{short_name}-{self.edited_suffix}.{ext}"
-                    else:
-                        short_title = short_name
-                        short_edited_name = f"{short_name}-{self.edited_suffix}"
+                for group, stem_title, replacements in candidates:
+                    # Skip stems with no candidate name in this directory
+                    if not listing.has_group(group):
+                        continue
                     
-                    short_edited_path = search_path / short_edited_name
-                    if short_edited_path.exists():
-                        # If found in base path, move original to edited_raw if it exists
-                        if search_path == self.base_path:
-                            orig_path = search_path / short_title
-                            if orig_path.exists():
-                                safe_move_file(str(orig_path), str(Path(self.edited_raw_dir) / short_title))
-                        return short_edited_name
+                    for replacement, own_json in replacements:
+                        # JSON files only live in the base directory, whichever directory holds the media
+                        if replacement in listing and (own_json is None or own_json not in base_listing):
+                            # If found in base path, move original to edited_raw if it exists
+                            if search_path == base_path and stem_title in listing:
+                                self._move_file(self._base_prefix + stem_title, self._edited_raw_prefix + stem_title)
+                            return search_path, replacement
                     
-                    if ext:
-                        short_alt_name = f"{short_name}(1).{ext}"
-                    else:
-                        short_alt_name = f"{short_name}(1)"
+                    # Check for original version
+                    if stem_title in listing:
+                        return search_path, stem_title
                     
-                    short_alt_path = search_path / short_alt_name
-                    if short_alt_path.exists():
-                        # If found in base path, move original to edited_raw if it exists
-                        if search_path == self.base_path:
-                            orig_path = search_path / short_title
-                            if orig_path.exists():
-                                safe_move_file(str(orig_path), str(Path(self.edited_raw_dir) / short_title))
-                        return short_alt_name
-                    
-                    short_orig_path = search_path / short_title
-                    if short_orig_path.exists():
-                        return short_title
-                    
-                    alt_name = check_if_same_name(short_title, short_title, self.media_moved, 1)
-                    alt_path = search_path / alt_name
-                    if alt_path.exists():
-                        return alt_name
+                    # Check for possible name conflicts
+                    conflict_name = conflict_names.get(stem_title)
+                    if conflict_name is None:
+                        conflict_name = check_if_same_name(stem_title, stem_title, self.media_moved, 1)
+                        conflict_names[stem_title] = conflict_name
+                    if conflict_name in listing:
+                        return search_path, conflict_name
             
             # No matching file found in any location
             return None
             
         except Exception as e:
             error_msg = f"Error searching for media file {title}: {str(e)}"
-            print(error_msg)
+            logger.warning(error_msg)
             self.error_logger.error(error_msg)
             return None
     
-    def process_json_file(self, json_file_path: str, progress_callback: Optional[Callable[[float], None]] = None) -> bool:
+    def process_json_file(
+        self,
+        json_file_path: str,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """Process a single JSON file and its associated media.
         
         Args:
             json_file_path: Path to the JSON file.
             progress_callback: Optional callback for progress updates.
+            json_data: Contents of the JSON file, if the caller already parsed it.
             
         Returns:
             bool: True if processing was successful, False otherwise.
         """
+        match = self._match_json_file(json_file_path, json_data)
+        if isinstance(match, bool):
+            return match
+        try:
+            return self._apply_match(match)
+        finally:
+            self._unlink_pending()
+    
+    def iter_process_json_files(
+        self,
+        json_files: Iterable[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> Iterator[Tuple[str, bool]]:
+        """Process several JSON files and their associated media.
+        
+        The media files are claimed one at a time, in order, and the metadata
+        is then applied to the claimed files (in parallel for larger runs).
+        
+        Args:
+            json_files: (path, contents) pairs; contents is None if not parsed yet.
+            
+        Yields:
+            (path, success) for each JSON file as it completes.
+        """
         try:
-            # Convert to Path object and resolve
-            json_path = Path(json_file_path).resolve()
+            paths = []
+            matches = []
+            for json_file, json_data in json_files:
+                match = self._match_json_file(json_file, json_data)
+                if isinstance(match, MediaMatch):
+                    paths.append(json_file)
+                    matches.append(match)
+                else:
+                    yield json_file, match
+            
+            yield from zip(paths, self._apply_matches(matches))
+        finally:
+            self._unlink_pending()
+            flush_loggers(self.error_logger, self.missing_logger)
+    
+    def _count_result(self, success: bool) -> None:
+        """Increment the success or error counter."""
+        with self._lock:
+            if success:
+                self.success_counter += 1
+            else:
+                self.error_counter += 1
+    
+    def _match_json_file(self, json_file_path: str, json_data: Optional[Dict[str, Any]] = None) -> Union[MediaMatch, bool]:
+        """Load a JSON file, find its media file and claim it for processing.
+        
+        Claiming records the media file as already moved to the MatchedMedia
+        directory, so later searches see the same state as if it had been
+        processed. Matches must therefore be made one at a time, in order.
+        
+        Args:
+            json_file_path: Path to the JSON file.
+            json_data: Contents of the JSON file, if already parsed.
+            
+        Returns:
+            The claimed MediaMatch, True if the JSON file was already processed,
+            or False if it failed (the error is counted and logged).
+        """
+        try:
+            # Make the path absolute; abspath is purely lexical, unlike Path.resolve()
+            json_path = os.path.abspath(json_file_path)
             
             # Skip if already processed (JSON file no longer exists)
-            if not json_path.exists():
+            if not os.path.exists(json_path):
                 return True
             
-            # Validate metadata file
-            validation_result = validate_metadata_file(str(json_path), str(self.base_path))
+            # Validate the metadata file, parsing it only once
+            if json_data is None:
+                is_valid, error, json_data = self._file_validator.validate_json_file(json_path)
+            else:
+                is_valid, error = self._file_validator.validate_file(json_path, MAX_METADATA_BYTES)
+            
+            if is_valid:
+                validation_result = MetadataValidator().validate_metadata(json_data)
+            else:
+                validation_result = ValidationResult(is_valid=False, errors=[error], warnings=[])
+            
             if not validation_result.is_valid:
                 for error in validation_result.errors:
                     self.error_logger.error(f"Validation error in {json_file_path}: {error}")
                 for warning in validation_result.warnings:
                     self.error_logger.warning(f"Validation warning in {json_file_path}: {warning}")
-                self.error_counter += 1
+                self._count_result(False)
                 return False
             
-            # Load and extract metadata
-            with open(json_path, encoding="utf8") as f:
-                json_data = json.load(f)
-            
+            # Extract metadata
             metadata = extract_metadata_from_json(json_data)
             title_original = metadata['title']
             
-            # Search for media file
-            media_title = self.search_media_file(title_original)
+            # Search for media file; the search only returns files present in the listings
+            found = self._find_media_file(title_original)
             
-            if not media_title:
+            if not found:
                 self.missing_logger.info(title_original)
-                print(f"{title_original} not found")
-                self.error_counter += 1
+                logger.info(f"{title_original} not found")
+                self._count_result(False)
                 return False
             
-            # Get full path to media file and validate
-            media_path = None
-            search_paths = [
-                self.base_path,
-                Path(self.matched_media_dir),
-                Path(self.edited_raw_dir)
-            ]
-            
-            # Find the actual file location
-            for search_path in search_paths:
-                test_path = (search_path / media_title).resolve()
-                if test_path.exists():
-                    media_path = test_path
-                    break
-            
-            if not media_path:
-                self.missing_logger.info(media_title)
-                print(f"File not found: {media_title}")
-                self.error_counter += 1
-                return False
+            media_dir, media_title = found
+            media_path = os.path.join(media_dir, media_title)
             
             # Validate file access
-            file_validator = FileValidator(str(self.base_path))
-            is_valid, error = file_validator.validate_file(str(media_path))
+            is_valid, error = self._file_validator.validate_file(media_path)
             
             if not is_valid:
                 self.missing_logger.info(media_title)
-                print(f"File validation failed: {error}")
-                self.error_counter += 1
+                logger.info(f"File validation failed: {error}")
+                self._count_result(False)
                 return False
             
+            # Claim the media file
+            match = MediaMatch(
+                json_path=json_path,
+                media_path=media_path,
+                media_title=media_title,
+                dest_path=self._matched_media_prefix + media_title,
+                metadata=metadata
+            )
+            with self._lock:
+                self._record_removed(media_path)
+                self._record_added(match.dest_path)
+                self.media_moved.add(media_title)
+            return match
+                
+        except Exception as e:
+            error_msg = f"Error processing JSON {json_file_path}: {str(e)}"
+            logger.warning(error_msg)
+            self.error_logger.error(error_msg)
+            self._count_result(False)
+            return False
+    
+    def _release_match(self, match: MediaMatch, media_path: str) -> None:
+        """Undo the claim on a media file that could not be processed.
+        
+        Args:
+            match: The claimed match.
+            media_path: Current location of the media file.
+        """
+        with self._lock:
+            self._record_removed(match.dest_path)
+            self._record_added(media_path)
+            self.media_moved.discard(match.media_title)
+    
+    def _apply_match(self, match: MediaMatch) -> bool:
+        """Apply metadata to a claimed media file and move it to MatchedMedia.
+        
+        This only touches the files of the given match, so matches can be
+        applied concurrently.
+        
+        Args:
+            match: Match returned by _match_json_file.
+            
+        Returns:
+            bool: True if processing was successful, False otherwise.
+        """
+        media_path = match.media_path
+        media_title = match.media_title
+        metadata = match.metadata
+        moved = False
+        
+        try:
             # Get the timestamp
             timestamp = metadata['timestamp']
-            print(str(media_path))
+            logger.debug(media_path)
             
-            # Process EXIF data for supported formats
-            ext = media_path.suffix.lower()[1:] if media_path.suffix else ""
+            _, dot, ext = media_title.rpartition('.')
+            ext = ext.casefold() if dot else ""
             
-            if ext in self.config.EXIF_SUPPORTED_FORMATS:
+            # Process EXIF data for supported formats; images without geo data to
+            # write are not opened (or converted) at all
+            if metadata['has_geo'] and ext in self._exif_formats:
+                geo_data = metadata['geo_data']
+                latitude, longitude, altitude = geo_data['latitude'], geo_data['longitude'], geo_data['altitude']
+                
                 try:
                     # Convert to JPG if needed
-                    media_path = Path(convert_to_jpg_if_needed(str(media_path)))
+                    converted_path = convert_to_jpg_if_needed(media_path)
+                    if converted_path != media_path:
+                        with self._lock:
+                            self._record_removed(match.dest_path)
+                        match.dest_path = self._matched_media_prefix + os.path.basename(converted_path)
+                    media_path = converted_path
                     
-                    # Set EXIF data if geo data exists
-                    geo_data = metadata['geo_data']
-                    if any(geo_data.values()):
-                        try:
-                            set_exif_data(
-                                str(media_path),
-                                geo_data['latitude'],
-                                geo_data['longitude'],
-                                geo_data['altitude'],
-                                timestamp
-                            )
-                        except Exception as e:
-                            error_msg = f"EXIF data error for {media_path}: {str(e)}"
-                            print(error_msg)
-                            self.error_logger.error(error_msg)
-                            # Continue processing even if EXIF fails
+                    # Set EXIF data
+                    try:
+                        set_exif_data(media_path, latitude, longitude, altitude, timestamp)
+                    except Exception as e:
+                        error_msg = f"EXIF data error for {media_path}: {str(e)}"
+                        logger.warning(error_msg)
+                        self.error_logger.error(error_msg)
+                        # Continue processing even if EXIF fails
                 
                 except Exception as e:
                     error_msg = f"Error processing image {media_title}: {str(e)}"
-                    print(error_msg)
+                    logger.warning(error_msg)
                     self.error_logger.error(error_msg)
-                    self.error_counter += 1
+                    self._release_match(match, media_path)
+                    self._count_result(False)
                     return False
             
             # Set file timestamps
             try:
-                set_windows_file_time(str(media_path), timestamp)
+                set_windows_file_time(media_path, timestamp)
             except Exception as e:
                 error_msg = f"Error setting file time for {media_path}: {str(e)}"
-                print(error_msg)
+                logger.warning(error_msg)
                 self.error_logger.error(error_msg)
             
-            # Move file and delete JSON
-            try:
-                dest_path = Path(self.matched_media_dir) / media_path.name
-                if safe_move_file(str(media_path), str(dest_path)):
-                    os.remove(json_path)
-                    self.media_moved.append(media_title)
-                    self.success_counter += 1
-                    return True
-                else:
-                    error_msg = f"Error moving file {media_path}"
-                    print(error_msg)
-                    self.error_logger.error(error_msg)
-                    self.error_counter += 1
-                    return False
-                    
-            except Exception as e:
-                error_msg = f"Error moving file {media_path}: {str(e)}"
-                print(error_msg)
+            # Move file and queue the JSON for deletion
+            if safe_move_file(media_path, match.dest_path):
+                moved = True
+                with self._lock:
+                    self._pending_unlinks.append(match.json_path)
+                    flush = len(self._pending_unlinks) >= PENDING_UNLINK_LIMIT
+                    self._record_added(match.dest_path)
+                    self._record_removed(match.json_path)
+                if flush:
+                    self._unlink_pending()
+                self._count_result(True)
+                return True
+            else:
+                error_msg = f"Error moving file {media_path}"
+                logger.warning(error_msg)
                 self.error_logger.error(error_msg)
-                self.error_counter += 1
+                self._release_match(match, media_path)
+                self._count_result(False)
                 return False
                 
         except Exception as e:
-            error_msg = f"Error processing JSON {json_file_path}: {str(e)}"
-            print(error_msg)
+            error_msg = f"Error processing media {media_path}: {str(e)}"
+            logger.warning(error_msg)
             self.error_logger.error(error_msg)
-            self.error_counter += 1
+            if not moved:
+                self._release_match(match, media_path)
+            self._count_result(False)
             return False
     
+    def _apply_matches(self, matches: List[MediaMatch]) -> Iterator[bool]:
+        """Apply claimed matches, in parallel for larger runs.
+        
+        Args:
+            matches: Matches claimed by _match_json_file.
+            
+        Yields:
+            The result of each match, in order.
+        """
+        if len(matches) < PARALLEL_THRESHOLD:
+            for match in matches:
+                yield self._apply_match(match)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.config.MAX_WORKERS, len(matches))) as executor:
+                yield from executor.map(self._apply_match, matches)
+    
+    def _unlink_pending(self) -> None:
+        """Delete the JSON files of media processed since the last call."""
+        with self._lock:
+            pending, self._pending_unlinks = self._pending_unlinks, []
+        
+        for json_path in pending:
+            try:
+                os.unlink(json_path)
+            except OSError as e:
+                error_msg = f"Error deleting {json_path}: {str(e)}"
+                logger.warning(error_msg)
+                self.error_logger.error(error_msg)
+    
     def process_all(self, progress_callback: Optional[Callable[[float, int, int], None]] = None) -> Tuple[int, int]:
         """Process all JSON files in the base directory.
         
@@ -342,61 +600,111 @@ class MediaProcessor:
         self.error_logger.error("=== Starting new processing session ===")
         self.missing_logger.info("=== Missing Files List ===")
         
+        # Start from fresh listings; the directories may have changed since the
+        # last run of this processor
+        with self._lock:
+            self._dir_index.clear()
+        
         try:
-            # Get all JSON files
-            json_files = []
-            for entry in os.scandir(self.base_path):
-                if entry.is_file() and entry.name.endswith(".json"):
-                    json_files.append(entry.path)
-            
-            # Sort by name length to process shorter names first
-            json_files.sort(key=lambda s: len(os.path.basename(s)))
+            # Get all JSON files as (name_length, path) pairs; the name test runs
+            # first so the dirent file type is only consulted for JSON names
+            json_entries = [
+                (len(entry.name), entry.path) for entry in os.scandir(self.base_path)
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+            ]
+            
+            # Sort by name length to process shorter names first (stable, so
+            # names of equal length keep their directory order)
+            json_entries.sort(key=itemgetter(0))
+            json_files = [path for _, path in json_entries]
             total_files = len(json_files)
             
-            # Process each JSON file
-            for i, json_file in enumerate(json_files):
-                # Calculate progress
-                progress = (i / total_files) * 100 if total_files > 0 else 0
-                
-                # Update progress if callback provided
-                if progress_callback:
+            completed = 0
+            
+            # Report every report_step files (and at the end) rather than for every file
+            report_step = max(1, total_files // PROGRESS_REPORTS)
+            
+            def report_progress() -> None:
+                if progress_callback and (completed % report_step == 0 or completed == total_files):
+                    progress = (completed / total_files) * 100
                     progress_callback(progress, self.success_counter, self.error_counter)
-                
-                # Process the JSON file
-                self.process_json_file(json_file)
+            
+            # Match JSON files to media one at a time, in order, so that each
+            # search sees the files claimed by the previous ones
+            matches = []
+            for json_file in json_files:
+                match = self._match_json_file(json_file)
+                if isinstance(match, MediaMatch):
+                    matches.append(match)
+                else:
+                    completed += 1
+                    report_progress()
+            
+            # Apply metadata and move the matched files
+            for _ in self._apply_matches(matches):
+                completed += 1
+                report_progress()
         
         except Exception as e:
             error_msg = f"Error during processing: {str(e)}"
-            print(error_msg)
+            logger.warning(error_msg)
             self.error_logger.error(error_msg)
         
+        finally:
+            # Delete the JSON files of all processed media in one pass
+            self._unlink_pending()
+        
         self.error_logger.error("=== Processing session ended ===")
         self.missing_logger.info("\n=== Processing session ended ===")
+        flush_loggers(self.error_logger, self.missing_logger)
         
         return self.success_counter, self.error_counter
 
-    def apply_template(self, media_file: str, template_name: str) -> bool:
+    def process_files(self, json_files: List[str], progress_callback: Optional[Callable[[float], None]] = None) -> int:
+        """Process a list of JSON files without creating backups.
+        
+        Args:
+            json_files: Paths to the JSON files to process.
+            progress_callback: Optional callback receiving the completed fraction (0-1).
+            
+        Returns:
+            Number of successfully processed files.
+        """
+        total_files = len(json_files)
+        success = 0
+        
+        for completed, (_, result) in enumerate(
+            self.iter_process_json_files((json_file, None) for json_file in json_files), 1
+        ):
+            success += result
+            if progress_callback:
+                progress_callback(completed / total_files)
+        
+        return success
+
+    def apply_template(self, media_file: str, template_name: str, preserve_exif: bool = True) -> bool:
         """Apply a metadata template to a media file.
         
         Args:
             media_file: Path to the media file
             template_name: Name of the template to apply
+            preserve_exif: Keep the EXIF tags already in the file
             
         Returns:
             True if successful, False otherwise
         """
         try:
             template = self.template_handler.load_template(template_name)
-            return self.apply_metadata(media_file, template)
+            return self.apply_metadata(media_file, template, preserve_exif)
         except Exception as e:
             self.error_logger.error(f"Failed to apply template {template_name} to {media_file}: {str(e)}")
             return False
 
-    def process_batch(self, files: List[str], progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def process_batch(self, files: Iterable[str], progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """Process a batch of files with automatic backup.
         
         Args:
-            files: List of files to process
+            files: Files to process (consumed lazily)
             progress_callback: Optional callback for progress updates
             
         Returns:
@@ -414,8 +722,7 @@ class MediaProcessor:
             Path to backup file if successful, None otherwise
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = load_json_file(file_path)
             return self.backup_handler.create_backup(file_path, metadata)
         except Exception as e:
             self.error_logger.error(f"Failed to create backup for {file_path}: {str(e)}")
@@ -437,12 +744,13 @@ class MediaProcessor:
             self.error_logger.error(f"Failed to restore from backup {backup_path}: {str(e)}")
             return False
 
-    def apply_metadata(self, media_file: str, metadata: Dict[str, Any]) -> bool:
+    def apply_metadata(self, media_file: str, metadata: Dict[str, Any], preserve_exif: bool = True) -> bool:
         """Apply metadata to a media file.
         
         Args:
             media_file: Path to the media file
             metadata: Metadata to apply
+            preserve_exif: Keep the EXIF tags already in the file
             
         Returns:
             True if successful, False otherwise
@@ -452,24 +760,22 @@ class MediaProcessor:
             processed_metadata = extract_metadata_from_json(metadata)
             
             # Get file extension
-            ext = os.path.splitext(media_file)[1].lower()[1:]
+            ext = os.path.splitext(media_file)[1][1:].casefold()
             
-            # Process EXIF data for supported formats
-            if ext in self.config.EXIF_SUPPORTED_FORMATS:
+            # Process EXIF data for supported formats that have geo data to write
+            if processed_metadata['has_geo'] and ext in self._exif_formats:
+                geo_data = processed_metadata['geo_data']
+                latitude, longitude, altitude = geo_data['latitude'], geo_data['longitude'], geo_data['altitude']
+                
                 try:
                     # Convert to JPG if needed
                     media_file = convert_to_jpg_if_needed(media_file)
                     
-                    # Set EXIF data if geo data exists
-                    geo_data = processed_metadata['geo_data']
-                    if any(geo_data.values()):
-                        set_exif_data(
-                            media_file,
-                            geo_data['latitude'],
-                            geo_data['longitude'],
-                            geo_data['altitude'],
-                            processed_metadata['timestamp']
-                        )
+                    # Set EXIF data
+                    set_exif_data(
+                        media_file, latitude, longitude, altitude, processed_metadata['timestamp'],
+                        preserve_existing=preserve_exif
+                    )
                 except Exception as e:
                     self.error_logger.error(f"EXIF data error for {media_file}: {str(e)}")
                     return False
@@ -5,11 +5,16 @@ This module provides access to the application icon.
 """
 
 import os
-from pathlib import Path
+from functools import lru_cache
 
+
+@lru_cache(maxsize=1)
 def get_icon_path():
     """Get path to the icon file.
     
+    The result is cached, since the packaged icon does not change while the
+    application runs.
+    
     Returns:
         str: Path to the icon file.
     """
@@ -24,4 +29,21 @@ def get_icon_path():
         print(f"Warning: Icon file not found at {icon_file}")
         return None
     
-    return icon_file 
\ No newline at end of file
+    return icon_file 
+
+
+@lru_cache(maxsize=1)
+def get_taskbar_icon_path():
+    """Get path to the pre-rendered 32x32 taskbar icon.
+    
+    Returns:
+        str: Path to the icon file, or None if it is missing.
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    icon_file = os.path.join(current_dir, "icons", "app_icon_32.png")
+    
+    if not os.path.exists(icon_file):
+        print(f"Warning: Icon file not found at {icon_file}")
+        return None
+    
+    return icon_file
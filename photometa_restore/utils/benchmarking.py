@@ -4,17 +4,29 @@ Benchmarking utilities for photometa-restore.
 This module provides tools for measuring and analyzing performance metrics.
 """
 
+import atexit
 import time
 import psutil
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
-import json
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+from .json_utils import dump_json_file, dumps_line
+
+# Minimum time in seconds between two CPU samples taken by record_cpu
+CPU_SAMPLE_INTERVAL = 0.1
+
+# Append-only file holding one JSON object per benchmarked operation
+METRICS_FILENAME = "benchmarks.ndjson"
+
+# Summary of the operations covered by the last generated report
+REPORT_FILENAME = "benchmark_report.json"
+
 
 @dataclass
 class PerformanceMetrics:
@@ -59,15 +71,39 @@ class PerformanceMonitor:
         self.process = psutil.Process()
         self.metrics_history: List[Dict[str, Any]] = []
         
+        # Unbuffered, so each record is written with a single write call
+        self._metrics_file = open(self.output_dir / METRICS_FILENAME, 'ab', buffering=0)
+        atexit.register(self._metrics_file.close)
+        
+    def close(self) -> None:
+        """Close the metrics file."""
+        self._metrics_file.close()
+        atexit.unregister(self._metrics_file.close)
+        
     def start_operation(self) -> None:
         """Start monitoring an operation."""
         self.start_time = time.time()
-        self.initial_memory = self.process.memory_info().rss / 1024 / 1024  # MB
+        with self.process.oneshot():
+            self.initial_memory = self.process.memory_info().rss / 1024 / 1024  # MB
+            # The first cpu_percent call only sets the baseline and returns 0.0
+            self.process.cpu_percent()
         self.cpu_times = []
+        self._last_cpu_sample = time.monotonic()
         
     def record_cpu(self) -> None:
-        """Record current CPU usage."""
-        self.cpu_times.append(self.process.cpu_percent())
+        """Record current CPU usage.
+        
+        Calls closer together than CPU_SAMPLE_INTERVAL (counting from the
+        start of the operation) are ignored. psutil needs that much time
+        between samples to give a meaningful value, and sampling from a hot
+        loop would slow down the monitored work.
+        """
+        now = time.monotonic()
+        if now - self._last_cpu_sample < CPU_SAMPLE_INTERVAL:
+            return
+        self._last_cpu_sample = now
+        with self.process.oneshot():
+            self.cpu_times.append(self.process.cpu_percent())
         
     def end_operation(
         self,
@@ -86,7 +122,8 @@ class PerformanceMonitor:
             PerformanceMetrics object with calculated metrics
         """
         end_time = time.time()
-        final_memory = self.process.memory_info().rss / 1024 / 1024  # MB
+        with self.process.oneshot():
+            final_memory = self.process.memory_info().rss / 1024 / 1024  # MB
         avg_cpu = sum(self.cpu_times) / len(self.cpu_times) if self.cpu_times else 0
         
         duration = end_time - self.start_time
@@ -109,21 +146,14 @@ class PerformanceMonitor:
         return metrics
     
     def _save_metrics(self, metrics: PerformanceMetrics) -> None:
-        """Save metrics to file.
+        """Append metrics to the metrics file.
         
         Args:
             metrics: PerformanceMetrics object to save
         """
         metrics_dict = metrics.to_dict()
         self.metrics_history.append(metrics_dict)
-        
-        # Save to JSON file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"benchmark_{metrics.operation_type}_{timestamp}.json"
-        filepath = self.output_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(metrics_dict, f, indent=2)
+        self._metrics_file.write(dumps_line(metrics_dict))
     
     def generate_report(self, operation_type: Optional[str] = None) -> str:
         """Generate a human-readable performance report.
@@ -142,12 +172,24 @@ class PerformanceMonitor:
         if not relevant_metrics:
             return "No metrics available for report generation."
         
-        # Calculate averages
-        avg_duration = sum(m["duration_seconds"] for m in relevant_metrics) / len(relevant_metrics)
-        avg_rate = sum(m["processing_rate_fps"] for m in relevant_metrics) / len(relevant_metrics)
-        avg_success = sum(m["success_rate_percent"] for m in relevant_metrics) / len(relevant_metrics)
-        avg_memory = sum(m["memory_usage_mb"] for m in relevant_metrics) / len(relevant_metrics)
-        avg_cpu = sum(m["cpu_usage_percent"] for m in relevant_metrics) / len(relevant_metrics)
+        # Save the operations covered by this report as a single JSON document
+        dump_json_file(relevant_metrics, str(self.output_dir / REPORT_FILENAME))
+        
+        # Calculate averages, accumulating all totals in a single pass
+        total_duration = total_rate = total_success = total_memory = total_cpu = 0.0
+        for m in relevant_metrics:
+            total_duration += m["duration_seconds"]
+            total_rate += m["processing_rate_fps"]
+            total_success += m["success_rate_percent"]
+            total_memory += m["memory_usage_mb"]
+            total_cpu += m["cpu_usage_percent"]
+        
+        count = len(relevant_metrics)
+        avg_duration = total_duration / count
+        avg_rate = total_rate / count
+        avg_success = total_success / count
+        avg_memory = total_memory / count
+        avg_cpu = total_cpu / count
         
         report = [
             "Performance Report",
@@ -203,10 +245,21 @@ def create_test_dataset(
     target_pixels = (file_size_kb * 1024 * 10) // 3
     img_size = int(np.sqrt(target_pixels))
     
-    # Create test files
-    for i in range(num_files):
-        # Create a random image
-        img_array = np.random.randint(0, 256, (img_size, img_size, 3), dtype=np.uint8)
+    # Metadata shared by every test file; only the title and description vary
+    photo_taken_time = {
+        "timestamp": str(int(time.time())),
+        "formatted": datetime.now().isoformat()
+    }
+    geo_data = {
+        "latitude": 40.7128,
+        "longitude": -74.0060,
+        "altitude": 100.0
+    }
+    
+    def create_test_file(i: int, seed: np.random.SeedSequence) -> None:
+        # Create a random image (each file has its own generator, since
+        # generators are not thread-safe)
+        img_array = np.random.default_rng(seed).integers(0, 256, (img_size, img_size, 3), dtype=np.uint8)
         img = Image.fromarray(img_array)
         
         # Save image file
@@ -218,20 +271,18 @@ def create_test_dataset(
             metadata = {
                 "title": f"test_image_{i}.jpg",
                 "description": f"Test image {i}",
-                "photoTakenTime": {
-                    "timestamp": str(int(time.time())),
-                    "formatted": datetime.now().isoformat()
-                },
-                "geoData": {
-                    "latitude": 40.7128,
-                    "longitude": -74.0060,
-                    "altitude": 100.0
-                }
+                "photoTakenTime": photo_taken_time,
+                "geoData": geo_data
             }
             
             # Save metadata with .json extension
             meta_path = test_dir / f"test_image_{i}.jpg.json"
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            dump_json_file(metadata, str(meta_path))
+    
+    # Create test files in parallel; Pillow releases the GIL while encoding JPEGs
+    seeds = np.random.SeedSequence().spawn(num_files)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Consume the results so errors from the workers are raised here
+        list(executor.map(create_test_file, range(num_files), seeds))
     
     return str(test_dir) 
\ No newline at end of file
@@ -5,14 +5,93 @@ This module provides functions for file operations such as creating directories,
 moving files, and handling common file operations.
 """
 
+import errno
 import os
+import re
 import shutil
+import sys
 import time
-from typing import Optional, List, Tuple
+from functools import lru_cache
+from typing import Callable, Collection, Dict, Optional, Set, Tuple
 
 from ..config import get_config
 
 
+# Whether file names are compared without case on this platform (Windows and
+# macOS file systems are case-insensitive by default; os.path.normcase only
+# folds case on Windows)
+CASE_INSENSITIVE_NAMES = sys.platform in ("win32", "darwin")
+
+
+def normalize_file_name(name: str) -> str:
+    """Normalize a file name for comparison with other names on this platform.
+    
+    Args:
+        name: File name to normalize.
+        
+    Returns:
+        The casefolded name where file names are case-insensitive, else the name unchanged.
+    """
+    return name.casefold() if CASE_INSENSITIVE_NAMES else name
+
+
+class DirectoryIndex:
+    """In-memory listing of the files in a directory.
+    
+    Names are stored normalized with normalize_file_name, so lookups ignore
+    case on Windows and macOS, whose file systems are case-insensitive by
+    default. Each name is also counted under a group key, which lets callers
+    check with a single lookup whether the directory holds any name of a group.
+    """
+    
+    def __init__(self, directory: str, group_key: Callable[[str], str]):
+        """Scan the directory and build the index.
+        
+        Args:
+            directory: Directory to index (an empty index is built if it does not exist).
+            group_key: Function mapping a normalized name to its group key.
+        """
+        self._group_key = group_key
+        self._names: Set[str] = set()
+        self._groups: Dict[str, int] = {}
+        
+        try:
+            for entry in os.scandir(directory):
+                # The entry type comes from the directory listing itself, so
+                # leaving out subdirectories costs no extra stat (symlinks are
+                # kept without being followed; validate_file checks their target)
+                if not entry.is_dir(follow_symlinks=False):
+                    self.add(entry.name)
+        except FileNotFoundError:
+            pass
+    
+    def __contains__(self, name: str) -> bool:
+        return normalize_file_name(name) in self._names
+    
+    def add(self, name: str) -> None:
+        """Record an entry added to the directory."""
+        name = normalize_file_name(name)
+        if name not in self._names:
+            self._names.add(name)
+            key = self._group_key(name)
+            self._groups[key] = self._groups.get(key, 0) + 1
+    
+    def discard(self, name: str) -> None:
+        """Record an entry removed from the directory."""
+        name = normalize_file_name(name)
+        if name in self._names:
+            self._names.remove(name)
+            key = self._group_key(name)
+            if self._groups[key] == 1:
+                del self._groups[key]
+            else:
+                self._groups[key] -= 1
+    
+    def has_group(self, key: str) -> bool:
+        """Check whether any entry belongs to the given (normalized) group key."""
+        return key in self._groups
+
+
 def create_required_folders(base_path: str) -> Tuple[str, str]:
     """Create the required folders for the application.
     
@@ -27,11 +106,8 @@ def create_required_folders(base_path: str) -> Tuple[str, str]:
     matched_media_dir = os.path.join(base_path, config.MATCHED_MEDIA_DIR)
     edited_raw_dir = os.path.join(base_path, config.EDITED_RAW_DIR)
     
-    if not os.path.exists(matched_media_dir):
-        os.makedirs(matched_media_dir)
-    
-    if not os.path.exists(edited_raw_dir):
-        os.makedirs(edited_raw_dir)
+    os.makedirs(matched_media_dir, exist_ok=True)
+    os.makedirs(edited_raw_dir, exist_ok=True)
     
     return matched_media_dir, edited_raw_dir
 
@@ -52,10 +128,14 @@ def safe_move_file(source_path: str, dest_path: str, max_retries: int = 3, retry
     
     while retries < max_retries:
         try:
-            if os.path.exists(dest_path):
-                os.remove(dest_path)  # Remove existing file if it exists
-            
-            shutil.move(source_path, dest_path)
+            try:
+                # Rename in place, replacing any existing destination file
+                os.replace(source_path, dest_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Source and destination are on different filesystems
+                shutil.move(source_path, dest_path)
             return True
         except PermissionError:
             # File might be in use, wait and retry
@@ -73,50 +153,51 @@ def safe_move_file(source_path: str, dest_path: str, max_retries: int = 3, retry
     return False
 
 
+# Characters stripped from titles by fix_title, matched in a single pass
+_INCOMPATIBLE_CHARS = re.compile(r'[%<>=:?¿*#&{}\\@!+|"\']')
+
+
+@lru_cache(maxsize=8192)
 def fix_title(title: str) -> str:
     """Remove incompatible characters from file titles.
     
+    Results are memoized, since the same titles recur across edited and
+    duplicate variants in a Takeout export.
+    
     Args:
         title: Original file title.
         
     Returns:
         Sanitized file title.
     """
-    incompatible_chars = [
-        "%", "<", ">", "=", ":", "?", "¿", "*", "#", "&", 
-        "{", "}", "\\", "@", "!", "¿", "+", "|", "\"", "\'"
-    ]
-    
-    result = str(title)
-    for char in incompatible_chars:
-        result = result.replace(char, "")
-    
-    return result
+    return _INCOMPATIBLE_CHARS.sub("", str(title))
 
 
-def check_if_same_name(title: str, title_fixed: str, media_moved: List[str], recursion_time: int) -> str:
-    """Recursively check if a file name already exists in moved media and append suffix if needed.
+def check_if_same_name(title: str, title_fixed: str, media_moved: Collection[str], recursion_time: int) -> str:
+    """Check if a file name already exists in moved media and append a counter if needed.
     
     Args:
         title: Original file title.
         title_fixed: Fixed file title (may have already been processed).
-        media_moved: List of already moved media files.
-        recursion_time: Counter for recursion to append to filename.
+        media_moved: Already moved media files (a set keeps the lookups constant-time).
+        recursion_time: First counter to append to the filename.
         
     Returns:
         Unique file name.
     """
-    if title_fixed in media_moved:
-        # Split the title into name and extension (if any)
-        parts = title.rsplit('.', 1) if '.' in title else [title, '']
-        
-        if len(parts) == 2:
-            name, ext = parts
-            title_fixed = f"{name}({recursion_time}).{ext}"
-        else:
-            name = parts[0]
-            title_fixed = f"{name}({recursion_time})"
-            
-        return check_if_same_name(title, title_fixed, media_moved, recursion_time + 1)
+    if title_fixed not in media_moved:
+        return title_fixed
+    
+    # Split the title into name and extension once; only the counter changes
+    name, dot, ext = title.rpartition('.')
+    if dot:
+        suffix = f").{ext}"
     else:
-        return title_fixed 
\ No newline at end of file
+        name, suffix = title, ")"
+    
+    counter = recursion_time
+    title_fixed = f"{name}({counter}{suffix}"
+    while title_fixed in media_moved:
+        counter += 1
+        title_fixed = f"{name}({counter}{suffix}"
+    return title_fixed
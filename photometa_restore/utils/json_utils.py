@@ -0,0 +1,75 @@
+"""
+JSON utilities for photometa-restore.
+
+This module provides helpers for reading and writing JSON files. orjson is
+used when it is installed and the standard library json module otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Buffer size for JSON file reads and writes
+IO_BUFFER_SIZE = 64 * 1024
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document.
+    
+    Args:
+        data: Raw JSON document.
+        
+    Returns:
+        The decoded Python object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_line(data: Any) -> bytes:
+    """Serialize an object as a single compact JSON line.
+    
+    Args:
+        data: Object to serialize.
+        
+    Returns:
+        The UTF-8 encoded document followed by a newline, for NDJSON files.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def load_json_file(file_path: str) -> Any:
+    """Load a JSON file.
+    
+    Args:
+        file_path: Path to the JSON file.
+        
+    Returns:
+        The decoded Python object.
+    """
+    with open(file_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        return loads(f.read())
+
+
+def dump_json_file(data: Any, file_path: str) -> None:
+    """Write an object to a JSON file with two-space indentation.
+    
+    Args:
+        data: Object to serialize.
+        file_path: Path to the output file.
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        # Serialize up front; json.dump would issue a write for every token
+        content = json.dumps(data, indent=2).encode('utf-8')
+    
+    with open(file_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(content)
@@ -5,12 +5,57 @@ This module provides functions to set up and configure loggers for the applicati
 """
 
 import os
+import atexit
 import logging
+import queue
 from datetime import datetime
-from typing import Tuple
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import Optional, Tuple
 
 from ..config import get_config
 
+# Number of records buffered in memory before the log files are written
+LOG_BUFFER_RECORDS = 256
+
+
+def _buffered_file_handler(path: str, log_format: str, flush_level: int) -> MemoryHandler:
+    """Create a file handler that writes records in batches.
+    
+    A plain FileHandler flushes its stream after every record. Records are
+    collected here and written when the buffer is full, when a record at
+    flush_level or above arrives, when flush_loggers is called, or when the
+    handler is closed.
+    
+    Args:
+        path: Path to the log file.
+        log_format: Format string for the records.
+        flush_level: Level of the records that are written out immediately.
+        
+    Returns:
+        Handler buffering records for the file.
+    """
+    file_handler = logging.FileHandler(path, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(log_format))
+    return MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=flush_level, target=file_handler)
+
+
+def _close_handlers(target_logger: logging.Logger) -> None:
+    """Remove and close the handlers of a logger, writing out buffered records."""
+    for handler in target_logger.handlers[:]:
+        target_logger.removeHandler(handler)
+        # MemoryHandler.close() flushes to the target and then drops it
+        target = handler.target if isinstance(handler, MemoryHandler) else None
+        handler.close()
+        if target is not None:
+            target.close()
+
+
+def flush_loggers(*loggers: logging.Logger) -> None:
+    """Write the buffered records of the given loggers to their files."""
+    for target_logger in loggers:
+        for handler in target_logger.handlers:
+            handler.flush()
+
 
 def setup_logging(base_path: str) -> Tuple[logging.Logger, logging.Logger]:
     """Set up logging for the application.
@@ -25,8 +70,7 @@ def setup_logging(base_path: str) -> Tuple[logging.Logger, logging.Logger]:
     
     # Create logs directory
     logs_dir = os.path.join(base_path, config.LOGS_DIR)
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
+    os.makedirs(logs_dir, exist_ok=True)
     
     # Get timestamps for log file names
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -41,23 +85,55 @@ def setup_logging(base_path: str) -> Tuple[logging.Logger, logging.Logger]:
     error_logger.setLevel(logging.ERROR)
     
     # Reset handlers if they exist (to avoid duplicates)
-    if error_logger.handlers:
-        error_logger.handlers.clear()
-        
-    error_handler = logging.FileHandler(error_log_path, encoding='utf-8')
-    error_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-    error_logger.addHandler(error_handler)
+    _close_handlers(error_logger)
+    # Errors are written as they happen, so they survive a crash or kill
+    error_logger.addHandler(
+        _buffered_file_handler(error_log_path, '%(asctime)s - %(message)s', logging.ERROR)
+    )
     
     # Configure missing files logger
     missing_logger = logging.getLogger('missing_logger')
     missing_logger.setLevel(logging.INFO)
     
     # Reset handlers if they exist
-    if missing_logger.handlers:
-        missing_logger.handlers.clear()
-        
-    missing_handler = logging.FileHandler(missing_files_log_path, encoding='utf-8')
-    missing_handler.setFormatter(logging.Formatter('%(message)s'))
-    missing_logger.addHandler(missing_handler)
+    _close_handlers(missing_logger)
+    # Missing file names wait for the buffer to fill or an explicit flush
+    missing_logger.addHandler(
+        _buffered_file_handler(missing_files_log_path, '%(message)s', logging.CRITICAL + 1)
+    )
+    
+    return error_logger, missing_logger 
+
+
+_console_listener: Optional[QueueListener] = None
+
+
+def setup_console_logging(verbose: bool = False) -> None:
+    """Send the package's diagnostic messages to the console.
+    
+    Only warnings are shown by default; per-file messages are shown in verbose
+    mode. Records are queued by the calling threads and written to stderr by
+    a background listener, so processing never waits on the console. The
+    listener is flushed and stopped at interpreter exit.
     
-    return error_logger, missing_logger 
\ No newline at end of file
+    Args:
+        verbose: Also show per-file messages.
+    """
+    global _console_listener
+    
+    package_logger = logging.getLogger('photometa_restore')
+    package_logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+    
+    if _console_listener is not None:
+        return
+    
+    log_queue: queue.Queue = queue.Queue()
+    package_logger.addHandler(QueueHandler(log_queue))
+    package_logger.propagate = False
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    _console_listener = QueueListener(log_queue, console_handler)
+    _console_listener.start()
+    atexit.register(_console_listener.stop)
+
@@ -5,10 +5,11 @@ This module provides functions for manipulating metadata in media files,
 including EXIF data and file timestamps.
 """
 
+import io
 import os
-import time
+import sys
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 import piexif
 from win32_setctime import setctime
@@ -16,19 +17,46 @@ from PIL import Image
 
 
 def set_windows_file_time(filepath: str, timestamp: int) -> None:
-    """Set Windows file creation and modification time.
+    """Set file creation (Windows only) and modification time.
+    
+    Other platforms have no settable creation time, so only the access and
+    modification times are set there.
     
     Args:
         filepath: Path to the file.
         timestamp: Unix timestamp to set.
     """
-    setctime(filepath, timestamp)  # Set windows file creation time
-    date = datetime.fromtimestamp(timestamp)
-    mod_time = time.mktime(date.timetuple())
-    os.utime(filepath, (mod_time, mod_time))  # Set windows file modification time
+    if sys.platform == "win32":
+        setctime(filepath, timestamp)  # Set windows file creation time
+    os.utime(filepath, (timestamp, timestamp))  # Set file modification time
+
+
+def _to_dms_rational(value: float) -> Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]:
+    """Convert a coordinate to EXIF degrees/minutes/seconds rationals.
+    
+    The value is rounded once to hundredths of an arc-second and split with
+    integer arithmetic, so no floating-point error accumulates between parts.
+    
+    Args:
+        value: Latitude or longitude in decimal degrees (the sign is ignored).
+        
+    Returns:
+        ((degrees, 1), (minutes, 1), (hundredths_of_seconds, 100)).
+    """
+    hundredths = round(abs(value) * 360000)
+    degrees, rest = divmod(hundredths, 360000)
+    minutes, seconds = divmod(rest, 6000)
+    return (degrees, 1), (minutes, 1), (seconds, 100)
 
 
-def set_exif_data(file_path: str, latitude: float, longitude: float, altitude: float, timestamp: int) -> None:
+def set_exif_data(
+    file_path: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timestamp: int,
+    preserve_existing: bool = True
+) -> None:
     """Set EXIF data in an image file.
     
     Args:
@@ -37,12 +65,22 @@ def set_exif_data(file_path: str, latitude: float, longitude: float, altitude: f
         longitude: GPS longitude
         altitude: GPS altitude in meters
         timestamp: Unix timestamp
+        preserve_existing: Keep the tags already in the file. When False the
+            existing EXIF data is not parsed and is replaced by the new tags.
     """
     try:
+        # Read the image once; the EXIF data is loaded from and inserted into these bytes
+        with open(file_path, 'rb') as f:
+            image_data = f.read()
+        
         # Load existing EXIF data or create new
-        try:
-            exif_dict = piexif.load(file_path)
-        except:
+        exif_dict = None
+        if preserve_existing:
+            try:
+                exif_dict = piexif.load(image_data)
+            except:
+                pass
+        if exif_dict is None:
             exif_dict = {
                 "0th": {},
                 "Exif": {},
@@ -51,25 +89,15 @@ def set_exif_data(file_path: str, latitude: float, longitude: float, altitude: f
                 "thumbnail": None
             }
         
-        # Convert latitude to degrees/minutes/seconds
-        lat_deg = int(abs(latitude))
-        lat_min = int((abs(latitude) - lat_deg) * 60)
-        lat_sec = int(((abs(latitude) - lat_deg) * 60 - lat_min) * 60 * 100)
-        
-        # Convert longitude to degrees/minutes/seconds
-        lon_deg = int(abs(longitude))
-        lon_min = int((abs(longitude) - lon_deg) * 60)
-        lon_sec = int(((abs(longitude) - lon_deg) * 60 - lon_min) * 60 * 100)
-        
         # Set GPS data
         exif_dict["GPS"] = {
             piexif.GPSIFD.GPSVersionID: (2, 0, 0, 0),
             piexif.GPSIFD.GPSLatitudeRef: 'N' if latitude >= 0 else 'S',
-            piexif.GPSIFD.GPSLatitude: ((lat_deg, 1), (lat_min, 1), (lat_sec, 100)),
+            piexif.GPSIFD.GPSLatitude: _to_dms_rational(latitude),
             piexif.GPSIFD.GPSLongitudeRef: 'E' if longitude >= 0 else 'W',
-            piexif.GPSIFD.GPSLongitude: ((lon_deg, 1), (lon_min, 1), (lon_sec, 100)),
+            piexif.GPSIFD.GPSLongitude: _to_dms_rational(longitude),
             piexif.GPSIFD.GPSAltitudeRef: 1 if altitude < 0 else 0,  # 0 = above sea level
-            piexif.GPSIFD.GPSAltitude: (int(abs(altitude) * 10), 10)
+            piexif.GPSIFD.GPSAltitude: (round(abs(altitude) * 100), 100)  # Centimetres
         }
         
         # Set date/time
@@ -82,9 +110,12 @@ def set_exif_data(file_path: str, latitude: float, longitude: float, altitude: f
         except Exception as e:
             print(f"Warning: Could not set date/time EXIF for {file_path}: {str(e)}")
         
-        # Save EXIF data
+        # Save EXIF data, writing the file back in a single pass
         exif_bytes = piexif.dump(exif_dict)
-        piexif.insert(exif_bytes, file_path)
+        output = io.BytesIO()
+        piexif.insert(exif_bytes, image_data, output)
+        with open(file_path, 'wb') as f:
+            f.write(output.getbuffer())
         
     except Exception as e:
         raise Exception(f"Error setting EXIF data for {file_path}: {str(e)}")
@@ -99,16 +130,15 @@ def convert_to_jpg_if_needed(filepath: str) -> str:
     Returns:
         Path to the converted file (may be the same as input if no conversion needed).
     """
+    # Opening reads only the header, which is enough to know the mode
     with Image.open(filepath) as img:
         if img.mode != 'RGB':
-            # Convert to RGB
-            rgb_img = img.convert('RGB')
-            
             # Create new filename with .jpg extension
             new_filepath = filepath.rsplit('.', 1)[0] + ".jpg"
             
-            # Only save if converting to a different file
+            # Only decode and save if converting to a different file
             if filepath != new_filepath:
+                rgb_img = img.convert('RGB')
                 rgb_img.save(new_filepath)
                 
                 # Delete old file if it exists
@@ -129,14 +159,21 @@ def extract_metadata_from_json(json_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dictionary of extracted metadata.
     """
+    geo_data = json_data.get('geoData', {})
+    latitude = geo_data.get('latitude', 0)
+    longitude = geo_data.get('longitude', 0)
+    altitude = geo_data.get('altitude', 0)
+    
     metadata = {
         'title': json_data.get('title', ''),
         'timestamp': int(json_data.get('photoTakenTime', {}).get('timestamp', 0)),
         'geo_data': {
-            'latitude': json_data.get('geoData', {}).get('latitude', 0),
-            'longitude': json_data.get('geoData', {}).get('longitude', 0),
-            'altitude': json_data.get('geoData', {}).get('altitude', 0),
-        }
+            'latitude': latitude,
+            'longitude': longitude,
+            'altitude': altitude,
+        },
+        # Whether there is any geo data to write (Takeout uses zeros when there is none)
+        'has_geo': bool(latitude or longitude or altitude)
     }
     
     return metadata 
\ No newline at end of file
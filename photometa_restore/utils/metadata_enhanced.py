@@ -8,12 +8,17 @@ This module provides advanced metadata functionality including:
 """
 
 import os
-import json
 import shutil
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple, Callable
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Any, Sized, Tuple, Callable
 from pathlib import Path
 
+from .json_utils import load_json_file, dump_json_file
+from .validation import FileValidator, MAX_METADATA_BYTES
+
 
 class MetadataBackup:
     """Handles metadata backup and restoration operations."""
@@ -27,6 +32,12 @@ class MetadataBackup:
         self.base_path = Path(base_path)
         self.backup_dir = self.base_path / "metadata_backups"
         self._ensure_backup_dir()
+        
+        # Backup paths are built with string operations rather than Path objects
+        self._backup_prefix = os.path.join(str(self.backup_dir), "")
+        
+        # Last formatted backup date, as (unix_seconds, formatted_date)
+        self._last_date: Tuple[int, str] = (-1, "")
     
     def _ensure_backup_dir(self):
         """Ensure backup directory exists."""
@@ -42,21 +53,27 @@ class MetadataBackup:
         Returns:
             Path to the backup file
         """
-        file_path = Path(file_path)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{file_path.stem}_{timestamp}.json"
-        backup_path = self.backup_dir / backup_name
+        # Nanosecond timestamps keep backups of the same file made within one
+        # second from overwriting each other
+        seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        backup_path = f"{self._backup_prefix}{stem}_{seconds}_{nanoseconds:09d}.json"
+        
+        # The readable date only changes once per second, so it is formatted once
+        last_seconds, backup_date = self._last_date
+        if last_seconds != seconds:
+            backup_date = datetime.fromtimestamp(seconds).strftime("%Y%m%d_%H%M%S")
+            self._last_date = (seconds, backup_date)
         
         backup_data = {
             "original_file": str(file_path),
-            "backup_date": timestamp,
+            "backup_date": backup_date,
             "metadata": metadata
         }
         
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(backup_data, f, indent=2)
-            
-        return str(backup_path)
+        dump_json_file(backup_data, backup_path)
+        
+        return backup_path
     
     def restore_from_backup(self, backup_path: str) -> Tuple[str, Dict[str, Any]]:
         """Restore metadata from a backup file.
@@ -67,8 +84,7 @@ class MetadataBackup:
         Returns:
             Tuple of (original file path, metadata)
         """
-        with open(backup_path, 'r', encoding='utf-8') as f:
-            backup_data = json.load(f)
+        backup_data = load_json_file(backup_path)
         
         return backup_data["original_file"], backup_data["metadata"]
 
@@ -84,6 +100,14 @@ class MetadataTemplate:
         """
         self.templates_dir = Path(templates_dir) if templates_dir else Path.home() / ".photometa_restore" / "templates"
         self._ensure_templates_dir()
+        self._templates_prefix = os.path.join(str(self.templates_dir), "")
+        
+        # Loaded templates keyed by name, stored with the file's mtime_ns at load time
+        self._cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+        
+        # Template names, stored with the directory's mtime_ns when they were listed
+        self._names_cache: Optional[Tuple[int, List[str]]] = None
     
     def _ensure_templates_dir(self):
         """Ensure templates directory exists."""
@@ -96,51 +120,86 @@ class MetadataTemplate:
             name: Template name
             template: Template metadata
         """
-        template_path = self.templates_dir / f"{name}.json"
-        with open(template_path, 'w', encoding='utf-8') as f:
-            json.dump(template, f, indent=2)
+        template_path = f"{self._templates_prefix}{name}.json"
+        dump_json_file(template, template_path)
+        with self._cache_lock:
+            self._cache.pop(name, None)
+            self._names_cache = None
     
     def load_template(self, name: str) -> Dict[str, Any]:
         """Load a metadata template.
         
+        Templates are cached and only re-read when the file's modification
+        time changes. The returned dictionary is shared and must not be modified.
+        
         Args:
             name: Template name
             
         Returns:
             Template metadata
         """
-        template_path = self.templates_dir / f"{name}.json"
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        template_path = f"{self._templates_prefix}{name}.json"
+        mtime_ns = os.stat(template_path).st_mtime_ns
+        
+        with self._cache_lock:
+            cached = self._cache.get(name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        template = load_json_file(template_path)
+        with self._cache_lock:
+            self._cache[name] = (mtime_ns, template)
+        return template
     
     def list_templates(self) -> List[str]:
         """List available templates.
         
+        The listing is cached and only rebuilt when the directory's
+        modification time changes (adding, removing or renaming a file).
+        
         Returns:
             List of template names
         """
-        return [f.stem for f in self.templates_dir.glob("*.json")]
+        mtime_ns = os.stat(self.templates_dir).st_mtime_ns
+        
+        with self._cache_lock:
+            cached = self._names_cache
+        if cached is not None and cached[0] == mtime_ns:
+            return list(cached[1])
+        
+        names = [
+            entry.name[:-len(".json")] for entry in os.scandir(self.templates_dir)
+            if entry.name.endswith(".json")
+        ]
+        with self._cache_lock:
+            self._names_cache = (mtime_ns, names)
+        return list(names)
 
 
 class BatchProcessor:
     """Handles batch processing of metadata operations."""
     
-    def __init__(self, processor, chunk_size: int = 10):
+    def __init__(self, processor, chunk_size: int = 64):
         """Initialize batch processor.
         
         Args:
             processor: MediaProcessor instance
-            chunk_size: Number of files to process in each batch
+            chunk_size: Number of files to process in each batch (the metadata
+                of a batch is applied in parallel once it holds enough files)
         """
         self.processor = processor
         self.chunk_size = chunk_size
         self.backup_handler = MetadataBackup(processor.base_path)
+        self.file_validator = FileValidator(processor.base_path)
     
-    def process_batch(self, files: List[str], progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def process_batch(self, files: Iterable[str], progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """Process a batch of files.
         
+        Files are consumed lazily in chunks of chunk_size, so any iterable can be
+        passed. Progress is only reported when the number of files is known.
+        
         Args:
-            files: List of files to process
+            files: Files to process
             progress_callback: Optional callback for progress updates
             
         Returns:
@@ -152,29 +211,47 @@ class BatchProcessor:
             "backups": []
         }
         
-        total_files = len(files)
+        total_files = len(files) if isinstance(files, Sized) else None
+        processed = 0
+        files_iter = iter(files)
         
-        for i, file_path in enumerate(files):
-            try:
-                # Create backup before processing
-                if file_path.endswith('.json'):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    backup_path = self.backup_handler.create_backup(file_path, metadata)
-                    results["backups"].append(backup_path)
-                
-                # Process the file
-                success = self.processor.process_json_file(file_path)
-                
+        while True:
+            chunk = list(islice(files_iter, self.chunk_size))
+            if not chunk:
+                break
+            
+            # Create backups before processing
+            to_process = []
+            for file_path in chunk:
+                try:
+                    # The processor treats a missing JSON file as already processed,
+                    # but a path passed in here that does not exist is an error.
+                    # Oversized files are rejected here, before they are loaded.
+                    is_valid, error = self.file_validator.validate_file(file_path, MAX_METADATA_BYTES)
+                    if not is_valid:
+                        raise ValueError(error)
+                    
+                    metadata = None
+                    if file_path.endswith('.json'):
+                        metadata = load_json_file(file_path)
+                        backup_path = self.backup_handler.create_backup(file_path, metadata)
+                        results["backups"].append(backup_path)
+                    to_process.append((file_path, metadata))
+                except Exception as e:
+                    results["failed"].append((file_path, str(e)))
+                    processed += 1
+                    if progress_callback and total_files:
+                        progress_callback(processed / total_files)
+            
+            # Process the chunk, reusing the JSON parsed for the backups
+            for file_path, success in self.processor.iter_process_json_files(to_process):
                 if success:
                     results["successful"].append(file_path)
                 else:
                     results["failed"].append(file_path)
                 
-                if progress_callback:
-                    progress_callback((i + 1) / total_files)
-                    
-            except Exception as e:
-                results["failed"].append((file_path, str(e)))
+                processed += 1
+                if progress_callback and total_files:
+                    progress_callback(processed / total_files)
         
-        return results 
\ No newline at end of file
+        return results
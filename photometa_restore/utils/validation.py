@@ -6,11 +6,17 @@ This module provides validation and error handling functionality for metadata op
 
 import os
 import json
+import stat
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from .json_utils import load_json_file
+
+# Largest metadata file that is parsed; Takeout sidecars are a few kilobytes
+MAX_METADATA_BYTES = 4 * 1024 * 1024
+
 
 @dataclass
 class ValidationResult:
@@ -69,10 +75,11 @@ class MetadataValidator:
         if 'geoData' in metadata:
             self._validate_geo_data(metadata['geoData'])
         
+        # reset() starts new lists, so these can be handed over without copying
         return ValidationResult(
-            is_valid=len(self._errors) == 0,
-            errors=self._errors.copy(),
-            warnings=self._warnings.copy()
+            is_valid=not self._errors,
+            errors=self._errors,
+            warnings=self._warnings
         )
     
     def _validate_required_fields(self, metadata: Dict[str, Any]):
@@ -125,36 +132,41 @@ class FileValidator:
             base_path: Base directory for file operations
         """
         self.base_path = Path(base_path).resolve()
+        self._base_path_str = str(self.base_path)
     
-    def validate_file(self, file_path: str) -> Tuple[bool, Optional[str]]:
+    def validate_file(self, file_path: str, max_size: Optional[int] = None) -> Tuple[bool, Optional[str]]:
         """Validate file existence and accessibility.
         
         Args:
             file_path: Path to the file to validate
+            max_size: Optional maximum file size in bytes
             
         Returns:
             Tuple of (is_valid, error_message)
         """
         try:
-            path = Path(file_path)
-            if not path.is_absolute():
-                path = (self.base_path / path).resolve()
+            # Work on plain strings; relative paths are resolved against the base path
+            path_str = os.fspath(file_path)
+            if not os.path.isabs(path_str):
+                path_str = os.path.realpath(os.path.join(self._base_path_str, path_str))
             
-            # Convert to string for os.access
-            path_str = str(path)
-            
-            if not path.exists():
+            # One stat answers both the existence and the file type checks
+            try:
+                file_stat = os.stat(path_str)
+            except OSError:
                 return False, f"File not found: {path_str}"
             
-            if not path.is_file():
+            if not stat.S_ISREG(file_stat.st_mode):
                 return False, f"Not a file: {path_str}"
             
-            # Check read access
-            if not os.access(path_str, os.R_OK):
-                return False, f"No read permission: {path_str}"
+            if max_size is not None and file_stat.st_size > max_size:
+                return False, f"File too large ({file_stat.st_size} bytes): {path_str}"
             
-            # Check write access
-            if not os.access(path_str, os.W_OK):
+            # Check read and write access together; the separate read check
+            # is only needed to word the error message
+            if not os.access(path_str, os.R_OK | os.W_OK):
+                if not os.access(path_str, os.R_OK):
+                    return False, f"No read permission: {path_str}"
                 return False, f"No write permission: {path_str}"
             
             return True, None
@@ -171,13 +183,13 @@ class FileValidator:
         Returns:
             Tuple of (is_valid, error_message, parsed_content)
         """
-        is_valid, error = self.validate_file(file_path)
+        # Reject oversized files before reading them
+        is_valid, error = self.validate_file(file_path, MAX_METADATA_BYTES)
         if not is_valid:
             return False, error, None
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = json.load(f)
+            content = load_json_file(file_path)
             return True, None, content
         except json.JSONDecodeError as e:
             return False, f"Invalid JSON format in {file_path}: {str(e)}", None
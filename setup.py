@@ -41,6 +41,9 @@ setup(
         "piexif",
         "win32-setctime",
     ],
+    extras_require={
+        "fast": ["orjson"],
+    },
     entry_points={
         "console_scripts": [
             "photometa-restore=photometa_restore.cli:run_cli",
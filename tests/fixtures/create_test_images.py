@@ -20,8 +20,10 @@ def create_base_image(path: Path, size: tuple = (800, 600)):
         size: Image dimensions (width, height)
     """
     if not path.exists():
-        # Create random image data
-        img_array = np.random.randint(0, 256, (*size, 3), dtype=np.uint8)
+        # Create random image data (rows are the height, columns the width)
+        width, height = size
+        rng = np.random.default_rng()
+        img_array = np.frombuffer(rng.bytes(width * height * 3), dtype=np.uint8).reshape(height, width, 3)
         img = Image.fromarray(img_array)
         
         # Save image
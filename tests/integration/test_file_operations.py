@@ -8,6 +8,7 @@ import tempfile
 import unittest
 
 from photometa_restore.utils.file_operations import (
+    DirectoryIndex,
     fix_title,
     check_if_same_name,
     create_required_folders
@@ -48,7 +49,8 @@ class TestFileOperations(unittest.TestCase):
         ]
         
         for input_title, expected_title in test_cases:
-            self.assertEqual(fix_title(input_title), expected_title)
+            with self.subTest(title=input_title):
+                self.assertEqual(fix_title(input_title), expected_title)
     
     def test_check_if_same_name(self):
         """Test checking for duplicate filenames."""
@@ -67,6 +69,15 @@ class TestFileOperations(unittest.TestCase):
         media_moved.append("file4(1).jpg")
         result = check_if_same_name("file4.jpg", "file4(1).jpg", media_moved, 1)
         self.assertEqual(result, "file4(2).jpg")
+        
+        # Test with a set and many taken names
+        media_moved = {"clip.mp4"} | {f"clip({i}).mp4" for i in range(1, 2000)}
+        result = check_if_same_name("clip.mp4", "clip.mp4", media_moved, 1)
+        self.assertEqual(result, "clip(2000).mp4")
+        
+        # Test a name without extension
+        result = check_if_same_name("file", "file", {"file", "file(1)"}, 1)
+        self.assertEqual(result, "file(2)")
     
     def test_create_required_folders(self):
         """Test creating required folders."""
@@ -79,7 +90,25 @@ class TestFileOperations(unittest.TestCase):
         # Check if directories are in the correct place
         self.assertEqual(os.path.dirname(matched_dir), self.test_dir)
         self.assertEqual(os.path.dirname(edited_dir), self.test_dir)
+    
+    def test_directory_index(self):
+        """Test indexing the files of a directory."""
+        with open(os.path.join(self.test_dir, "photo.jpg"), 'w'):
+            pass
+        os.mkdir(os.path.join(self.test_dir, "album"))
+        
+        index = DirectoryIndex(self.test_dir, lambda name: name.rpartition('.')[0])
+        
+        # Files are indexed, subdirectories are not
+        self.assertIn("photo.jpg", index)
+        self.assertNotIn("album", index)
+        self.assertTrue(index.has_group("photo"))
+        
+        # Removing the last name of a group removes the group
+        index.discard("photo.jpg")
+        self.assertNotIn("photo.jpg", index)
+        self.assertFalse(index.has_group("photo"))
 
 
 if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+    unittest.main() 
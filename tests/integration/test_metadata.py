@@ -0,0 +1,74 @@
+"""
+Tests for EXIF metadata utilities.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import piexif
+from PIL import Image
+
+from photometa_restore.utils.metadata import _to_dms_rational, set_exif_data
+
+
+class TestToDmsRational(unittest.TestCase):
+    """Test case for _to_dms_rational."""
+
+    def test_converts_coordinate(self):
+        """Test converting a coordinate to degrees, minutes and hundredths of seconds."""
+        self.assertEqual(_to_dms_rational(40.7128), ((40, 1), (42, 1), (4608, 100)))
+
+    def test_negative_coordinate(self):
+        """Test that the sign is dropped (it is stored in the reference tag)."""
+        self.assertEqual(_to_dms_rational(-74.006), _to_dms_rational(74.006))
+        self.assertEqual(_to_dms_rational(-74.006), ((74, 1), (0, 1), (2160, 100)))
+
+    def test_rounding_carries_over(self):
+        """Test that seconds rounded up to 60 carry into minutes and degrees."""
+        self.assertEqual(_to_dms_rational(10.9999999), ((11, 1), (0, 1), (0, 100)))
+
+
+class TestSetExifData(unittest.TestCase):
+    """Test case for set_exif_data."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.test_dir, "photo.jpg")
+        # A JPEG that already carries a camera make tag
+        exif = piexif.dump({"0th": {piexif.ImageIFD.Make: b"TestCam"}})
+        Image.new("RGB", (8, 8)).save(self.image_path, "JPEG", exif=exif)
+
+    def tearDown(self):
+        """Tear down test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, **kwargs):
+        """Write GPS data to the test image and return its EXIF data."""
+        set_exif_data(self.image_path, 40.7128, -74.006, 10.0, 1600000000, **kwargs)
+        return piexif.load(self.image_path)
+
+    def test_keeps_existing_tags(self):
+        """Test that existing tags are kept by default."""
+        exif_dict = self._write()
+        self.assertEqual(exif_dict["0th"].get(piexif.ImageIFD.Make), b"TestCam")
+        self.assertIn(piexif.GPSIFD.GPSLatitude, exif_dict["GPS"])
+
+    def test_altitude_in_centimetres(self):
+        """Test that the altitude is stored in centimetres."""
+        set_exif_data(self.image_path, 0.0, 0.0, 10.256, 1600000000)
+        gps = piexif.load(self.image_path)["GPS"]
+        self.assertEqual(gps[piexif.GPSIFD.GPSAltitude], (1026, 100))
+        self.assertEqual(gps[piexif.GPSIFD.GPSAltitudeRef], 0)
+
+    def test_drops_existing_tags(self):
+        """Test that existing tags are replaced with preserve_existing=False."""
+        exif_dict = self._write(preserve_existing=False)
+        self.assertNotIn(piexif.ImageIFD.Make, exif_dict["0th"])
+        self.assertIn(piexif.GPSIFD.GPSLatitude, exif_dict["GPS"])
+
+
+if __name__ == "__main__":
+    unittest.main()
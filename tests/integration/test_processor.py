@@ -0,0 +1,223 @@
+"""
+Tests for media file matching in MediaProcessor.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from photometa_restore.processor import MediaProcessor
+from photometa_restore.utils.validation import MAX_METADATA_BYTES
+
+
+class TestSearchMediaFile(unittest.TestCase):
+    """Test case for MediaProcessor.search_media_file."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def _touch(self, *parts):
+        """Create an empty file inside the test directory."""
+        path = os.path.join(self.test_dir, *parts)
+        with open(path, 'w'):
+            pass
+        return path
+
+    def test_finds_original(self):
+        """Test matching a file by its exact title."""
+        self._touch("photo.jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file("photo.jpg"), "photo.jpg")
+
+    def test_missing_file(self):
+        """Test that an unknown title is not matched."""
+        processor = MediaProcessor(self.test_dir)
+        self.assertIsNone(processor.search_media_file("missing.jpg"))
+
+    def test_edited_version_moves_original(self):
+        """Test that the edited version wins and the original is moved to EditedRaw."""
+        self._touch("photo.jpg")
+        self._touch("photo-edited.jpg")
+        processor = MediaProcessor(self.test_dir)
+
+        self.assertEqual(processor.search_media_file("photo.jpg"), "photo-edited.jpg")
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "photo.jpg")))
+        self.assertTrue(os.path.exists(os.path.join(processor.edited_raw_dir, "photo.jpg")))
+
+    def test_custom_edited_suffix(self):
+        """Test matching an edited version with a custom suffix."""
+        self._touch("photo-bearbeitet.jpg")
+        processor = MediaProcessor(self.test_dir, "bearbeitet")
+        self.assertEqual(processor.search_media_file("photo.jpg"), "photo-bearbeitet.jpg")
+
+    def test_numbered_version(self):
+        """Test matching a '(1)' version when no '(1).json' belongs to it."""
+        self._touch("photo(1).jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file("photo.jpg"), "photo(1).jpg")
+
+    def test_numbered_version_with_own_json(self):
+        """Test that a '(1)' version with its own JSON is not claimed."""
+        self._touch("photo(1).jpg")
+        self._touch("photo.jpg(1).json")
+        processor = MediaProcessor(self.test_dir)
+        self.assertIsNone(processor.search_media_file("photo.jpg"))
+
+    def test_numbered_version_with_own_json_in_matched_media(self):
+        """Test that a moved '(1)' version whose JSON is still pending is not claimed."""
+        processor = MediaProcessor(self.test_dir)
+        self._touch(processor.matched_media_dir, "photo.jpg")
+        self._touch(processor.matched_media_dir, "photo(1).jpg")
+        self._touch("photo.jpg(1).json")
+        self.assertEqual(processor.search_media_file("photo.jpg"), "photo.jpg")
+
+    def test_title_with_counter(self):
+        """Test matching the edited version of a title that already ends in '(n)'."""
+        self._touch("photo(2).jpg")
+        self._touch("photo(2)-edited.jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file("photo(2).jpg"), "photo(2)-edited.jpg")
+
+    def test_truncated_title(self):
+        """Test matching a file whose name was truncated to 47 characters."""
+        name = "a" * 60
+        self._touch(f"{name[:47]}.jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file(f"{name}.jpg"), f"{name[:47]}.jpg")
+
+    def test_incompatible_characters(self):
+        """Test that incompatible characters are stripped before matching."""
+        self._touch("photo1.jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file("photo:1?.jpg"), "photo1.jpg")
+
+    def test_finds_file_in_matched_media(self):
+        """Test matching a file that was already moved to MatchedMedia."""
+        processor = MediaProcessor(self.test_dir)
+        self._touch(processor.matched_media_dir, "photo.jpg")
+        self.assertEqual(processor.search_media_file("photo.jpg"), "photo.jpg")
+
+    def test_dotted_title_edited_version(self):
+        """Test matching the edited version of a title with a dot in its stem."""
+        self._touch("my.photo.jpg")
+        self._touch("my.photo-edited.jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file("my.photo.jpg"), "my.photo-edited.jpg")
+
+    def test_dotted_title_numbered_version(self):
+        """Test matching the '(1)' version of a title with a dot in its stem."""
+        self._touch("v1.2(1).mp4")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file("v1.2.mp4"), "v1.2(1).mp4")
+
+    def test_dotted_title_in_matched_media(self):
+        """Test matching a file with dots in its stem that was moved to MatchedMedia."""
+        processor = MediaProcessor(self.test_dir)
+        self._touch(processor.matched_media_dir, "Screenshot 2020.01.01.png")
+        self.assertEqual(
+            processor.search_media_file("Screenshot 2020.01.01.png"),
+            "Screenshot 2020.01.01.png"
+        )
+
+    def test_dotted_truncated_title(self):
+        """Test matching a truncated file whose name has dots in its stem."""
+        name = "trip.2020." + "b" * 50
+        self._touch(f"{name[:47]}.jpg")
+        processor = MediaProcessor(self.test_dir)
+        self.assertEqual(processor.search_media_file(f"{name}.jpg"), f"{name[:47]}.jpg")
+
+
+class TestProcessAll(unittest.TestCase):
+    """Test case for MediaProcessor.process_all."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def _create_pair(self, media_name, json_name, title):
+        """Create an empty media file and a JSON sidecar describing it."""
+        with open(os.path.join(self.test_dir, media_name), 'w'):
+            pass
+        metadata = {
+            "title": title,
+            "photoTakenTime": {"timestamp": "1614556800", "formatted": "March 1, 2021"},
+            "geoData": {"latitude": 0, "longitude": 0, "altitude": 0}
+        }
+        with open(os.path.join(self.test_dir, json_name), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+    def test_duplicate_titles(self):
+        """Test that two JSON files with the same title get different media files."""
+        self._create_pair("clip.mp4", "clip.mp4.json", "clip.mp4")
+        self._create_pair("clip(1).mp4", "clip.mp4(1).json", "clip.mp4")
+        processor = MediaProcessor(self.test_dir)
+
+        self.assertEqual(processor.process_all(), (2, 0))
+        self.assertEqual(
+            sorted(os.listdir(processor.matched_media_dir)),
+            ["clip(1).mp4", "clip.mp4"]
+        )
+
+    def test_many_files(self):
+        """Test processing enough files to use the thread pool."""
+        for i in range(40):
+            self._create_pair(f"clip_{i}.mp4", f"clip_{i}.mp4.json", f"clip_{i}.mp4")
+        processor = MediaProcessor(self.test_dir)
+
+        self.assertEqual(processor.process_all(), (40, 0))
+        self.assertEqual(len(os.listdir(processor.matched_media_dir)), 40)
+        self.assertFalse([name for name in os.listdir(self.test_dir) if name.endswith(".json")])
+
+
+
+class TestProcessBatch(unittest.TestCase):
+    """Test case for MediaProcessor.process_batch."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test environment."""
+        shutil.rmtree(self.test_dir)
+
+    def test_missing_files_fail(self):
+        """Test that paths that do not exist are reported as failures."""
+        processor = MediaProcessor(self.test_dir)
+        missing_media = os.path.join(self.test_dir, "nope.jpg")
+        missing_json = os.path.join(self.test_dir, "typo.json")
+
+        results = processor.process_batch([missing_media, missing_json])
+
+        self.assertEqual(results["successful"], [])
+        self.assertEqual([failure[0] for failure in results["failed"]], [missing_media, missing_json])
+        self.assertEqual(results["backups"], [])
+
+    def test_oversized_json_fails_before_backup(self):
+        """Test that an oversized JSON file is rejected without being loaded or backed up."""
+        processor = MediaProcessor(self.test_dir)
+        json_path = os.path.join(self.test_dir, "huge.jpg.json")
+        with open(json_path, 'wb') as f:
+            f.write(b' ' * (MAX_METADATA_BYTES + 1))
+
+        results = processor.process_batch([json_path])
+
+        self.assertEqual(results["successful"], [])
+        self.assertEqual(len(results["failed"]), 1)
+        self.assertIn("too large", results["failed"][0][1])
+        self.assertEqual(results["backups"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,9 @@ Utility functions for testing metadata processing.
 """
 
 import os
+import time
 import piexif
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
 
 def get_file_timestamp(file_path: Path) -> int:
@@ -80,4 +80,4 @@ def format_timestamp(timestamp: int) -> str:
     Returns:
         Formatted datetime string
     """
-    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") 
\ No newline at end of file
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) 
\ No newline at end of file